@@ -1,47 +1,44 @@
 # crypto_dashboard_dash_telegram.py
 import dash
-from dash import dcc, html, Input, Output, dash_table
+from dash import dcc, html, Input, Output, State, Patch, dash_table
 import pandas as pd
 import requests
 import time
 from datetime import datetime, timedelta
 import numpy as np
-from functools import wraps
 import plotly.graph_objs as go
 import plotly.express as px
 import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from types import MappingProxyType
 import json
 import ssl
 import urllib.request
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlsplit
 import certifi
 import io
+import hashlib
 import socket
 import os
+import tempfile
+import sqlite3
 from dotenv import load_dotenv
+import httpx
+import aiohttp
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 # Load environment variables
 load_dotenv()
 
-def rate_limit(calls_per_second=5):
-    """Rate limiting decorator to prevent API abuse"""
-    min_interval = 1.0 / calls_per_second
-    last_called = [0.0]
-    
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            elapsed = time.time() - last_called[0]
-            left_to_wait = min_interval - elapsed
-            if left_to_wait > 0:
-                time.sleep(left_to_wait)
-            ret = func(*args, **kwargs)
-            last_called[0] = time.time()
-            return ret
-        return wrapper
-    return decorator
-
-
 # Load configuration from environment variables with fallbacks
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '8494532235:AAE5JaJAhImWYkCUXQxU3pvHNkGJYY749vk')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID', '-4882717465')
@@ -50,24 +47,273 @@ CSV_URL = os.getenv('CSV_URL', 'https://docs.google.com/spreadsheets/d/e/2PACX-1
 DEBUG_MODE = os.getenv('DEBUG_MODE', 'False').lower() == 'true'
 
 # Cooldown configuration
+ALERT_THRESHOLD_PCT = 0.01  # Alert when price is within 1% of a level
 COOLDOWN_PCT = 0.012  # 1.2% hysteresis for alert cooldown
 MAX_ALERTS_MEMORY = 1000  # Maximum alerts to keep in memory
+ALERT_STATE_TTL_SECONDS = int(os.getenv('ALERT_STATE_TTL_SECONDS', 7 * 24 * 60 * 60))  # Forget alerts not seen for this long
+ALERT_STATE_DB = os.getenv('ALERT_STATE_DB', os.path.join(tempfile.gettempdir(), 'alert_state.sqlite3'))  # Empty disables persistence
+
+# Background refresh configuration
+REFRESH_INTERVAL_SECONDS = int(os.getenv('REFRESH_INTERVAL_SECONDS', 30))
+MANUAL_REFRESH_WAIT_SECONDS = float(os.getenv('MANUAL_REFRESH_WAIT_SECONDS', 10))
+
+# CoinGecko coin-id index configuration
+COINGECKO_INDEX_PATH = os.getenv('COINGECKO_INDEX_PATH', os.path.join(tempfile.gettempdir(), 'coingecko_coin_index.json'))
+COINGECKO_INDEX_TTL_SECONDS = int(os.getenv('COINGECKO_INDEX_TTL_SECONDS', 24 * 60 * 60))
+
+# Batched price lookup configuration
+COINGECKO_BATCH_SIZE = int(os.getenv('COINGECKO_BATCH_SIZE', 200))  # ids per /simple/price request
+CRYPTOCOMPARE_FSYMS_MAX_CHARS = 300  # pricemulti rejects longer fsyms lists
+BINANCE_TICKER_TTL_SECONDS = float(os.getenv('BINANCE_TICKER_TTL_SECONDS', 10))  # Reuse the all-symbols ticker within a cycle
+
+# Negative cache for symbols no provider can price: re-checked with exponential backoff
+UNRESOLVED_RECHECK_SECONDS = int(os.getenv('UNRESOLVED_RECHECK_SECONDS', 60))  # First re-check delay, doubled per miss
+UNRESOLVED_MAX_RECHECK_SECONDS = int(os.getenv('UNRESOLVED_MAX_RECHECK_SECONDS', 60 * 60))
+
+# Concurrent (asyncio/httpx) price engine configuration
+ASYNC_PRICE_FETCH = os.getenv('ASYNC_PRICE_FETCH', 'True').lower() == 'true'
+PRICE_HEDGING = os.getenv('PRICE_HEDGING', 'True').lower() == 'true'
+PRICE_HEDGE_DELAY_SECONDS = float(os.getenv('PRICE_HEDGE_DELAY_SECONDS', 1.0))  # Head start for the top provider
+PROVIDER_TIMEOUT_SECONDS = 15
+PROVIDER_CONCURRENCY = {
+    'CoinGecko': 2,
+    'CryptoCompare': 5,
+    'CoinCap': 5,
+    'Binance Spot (with proxy headers)': 10,
+    'Binance Futures (with proxy headers)': 10,
+}
+DEFAULT_PROVIDER_CONCURRENCY = 4
+
+# Per-provider circuit breaker: skip a failing provider for every symbol until a probe succeeds
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 3))  # Consecutive outages before opening
+CIRCUIT_COOLDOWN_SECONDS = int(os.getenv('CIRCUIT_COOLDOWN_SECONDS', 60))  # First cool-off, doubled after each failed probe
+CIRCUIT_MAX_COOLDOWN_SECONDS = 15 * 60
+
+# Adaptive provider ordering: rolling (EWMA) latency and success rate per provider and per symbol
+PROVIDER_STATS_ALPHA = float(os.getenv('PROVIDER_STATS_ALPHA', 0.2))  # Weight of the newest observation
+PROVIDER_DEFAULT_LATENCY = 1.0  # Seconds assumed for a provider before it has been measured
+PROVIDER_STATS_MAX_SYMBOLS = 5000  # Per-(provider, symbol) records kept, least recently used evicted
+PROVIDER_STATS_STALE_SECONDS = int(os.getenv('PROVIDER_STATS_STALE_SECONDS', 10 * 60))  # Older stats are ignored so demoted providers get re-tried
+
+# OHLC candle cache configuration
+OHLC_CACHE_DB = os.getenv('OHLC_CACHE_DB', '')  # Optional SQLite file for persisting closed candles
+OHLC_REFRESH_SECONDS = int(os.getenv('OHLC_REFRESH_SECONDS', 15))  # Reuse a symbol's candles fetched this recently
+OHLC_PAGE_LIMIT = 1000  # Binance klines maximum per request
+OHLC_FETCH_WORKERS = int(os.getenv('OHLC_FETCH_WORKERS', 4))  # Distinct symbols whose candles are fetched in parallel
+DAY_MS = 24 * 60 * 60 * 1000
+
+# CSV loader method memory: retry the last working method first, re-probe the default order periodically
+CSV_METHOD_REPROBE_SECONDS = int(os.getenv('CSV_METHOD_REPROBE_SECONDS', 15 * 60))
+
+# Background health monitor configuration
+HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv('HEALTH_CHECK_INTERVAL_SECONDS', 60))
+
+# Outbound Telegram queue configuration
+TELEGRAM_QUEUE_SIZE = int(os.getenv('TELEGRAM_QUEUE_SIZE', 100))  # Oldest pending alert is dropped beyond this
+
+# Telegram delivery tuning
+TELEGRAM_COALESCE_SECONDS = float(os.getenv('TELEGRAM_COALESCE_SECONDS', 1.0))  # Window for merging alerts into one message
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096  # Telegram sendMessage limit
+TELEGRAM_MAX_RETRY_AFTER = 60  # Never sleep longer than this on a 429
+
+# Per-host request budgets applied to every outbound HTTP call: (requests per second, burst)
+HOST_RATE_LIMITS = {
+    'api.coingecko.com': (0.5, 5),
+    'min-api.cryptocompare.com': (5, 10),
+    'api.coincap.io': (3, 10),
+    'api.binance.com': (10, 20),
+    'fapi.binance.com': (10, 20),
+    'api.telegram.org': (0.5, 3),
+    'docs.google.com': (1, 3),
+    'googleusercontent.com': (1, 3),
+}
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv('RATE_LIMIT_MAX_WAIT_SECONDS', 30))  # Give up rather than queue longer for a token
+
+# Shared HTTP client layer: keep-alive pool sizes (connections kept open per host)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))  # Default for hosts not listed below
+HOST_POOL_SIZES = {
+    'api.binance.com': 10,
+    'fapi.binance.com': 10,
+    'min-api.cryptocompare.com': 5,
+    'api.coincap.io': 5,
+    'api.coingecko.com': 2,
+    'api.telegram.org': 2,
+    'docs.google.com': 2,
+}
+HTTP2_ENABLED = os.getenv('HTTP2_ENABLED', 'True').lower() == 'true'  # Only used when the h2 package is installed
+
+# Optional streaming mode: live prices from an exchange WebSocket ticker stream, REST as fallback
+STREAMING_MODE = os.getenv('STREAMING_MODE', 'False').lower() == 'true'
+STREAM_URL = os.getenv('STREAM_URL', 'wss://fstream.binance.com/ws')  # Binance futures; point at a local stand-in for testing
+STREAM_STALE_SECONDS = float(os.getenv('STREAM_STALE_SECONDS', 15))  # Older ticks are refetched over REST
+STREAM_ALERT_INTERVAL_SECONDS = float(os.getenv('STREAM_ALERT_INTERVAL_SECONDS', 1.0))  # Per-ticker alert check throttle
+STREAM_RECONNECT_MAX_SECONDS = 60
+
+# Dashboard table: rows per page served by the server-side paging callback
+TABLE_PAGE_SIZE = 15
+SNAPSHOT_HISTORY_SIZE = 5  # Recent snapshots kept by version so client updates can be sent as diffs
 
 # Railway-specific configurations
 IS_RAILWAY = os.getenv('RAILWAY_ENVIRONMENT', '').lower() == 'production'
 RAILWAY_PORT = int(os.getenv('PORT', 8080))
 
+def open_sqlite(path):
+    """Open a SQLite database shared between the worker threads"""
+    connection = sqlite3.connect(path, check_same_thread=False, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+# Alert cooldown state: one record per (symbol, level kind, level price), kept in
+# least-recently-seen order so eviction pops from the front in O(1).
+AlertKey = namedtuple('AlertKey', ['symbol', 'kind', 'level'])
+
+alert_state = {"records": OrderedDict(), "touched": set(), "db": None, "loaded": False, "lock": threading.RLock()}
+
+
+def get_alert_db():
+    """Return the alert-state database, or None when ALERT_STATE_DB is empty or unusable"""
+    if not ALERT_STATE_DB:
+        return None
+    if alert_state["db"] is None:
+        try:
+            db = open_sqlite(ALERT_STATE_DB)
+            db.execute("CREATE TABLE IF NOT EXISTS alert_state ("
+                       "symbol TEXT NOT NULL, kind TEXT NOT NULL, level REAL NOT NULL, label TEXT NOT NULL, "
+                       "fired_price REAL, last_fired REAL NOT NULL, last_seen REAL NOT NULL, "
+                       "PRIMARY KEY (symbol, kind, level))")
+            db.commit()
+            alert_state["db"] = db
+        except sqlite3.Error as e:
+            if DEBUG_MODE:
+                print(f"❌ Could not open alert state database: {str(e)}")
+            return None
+    return alert_state["db"]
+
+
+def write_alert_db(statement, rows):
+    """Apply a write to the alert-state database; persistence failures never block alerting"""
+    db = get_alert_db()
+    if db is None or not rows:
+        return
+    try:
+        with db:
+            db.executemany(statement, rows)
+    except sqlite3.Error as e:
+        if DEBUG_MODE:
+            print(f"❌ Alert state write failed: {str(e)}")
+
+
+def load_alert_state():
+    """Restore cooldown records persisted by a previous worker (once per process)"""
+    with alert_state["lock"]:
+        if alert_state["loaded"]:
+            return
+        alert_state["loaded"] = True
+        
+        db = get_alert_db()
+        if db is None:
+            return
+        
+        try:
+            rows = db.execute(
+                "SELECT symbol, kind, level, label, fired_price, last_fired, last_seen FROM alert_state "
+                "WHERE last_seen >= ? ORDER BY last_seen DESC LIMIT ?",
+                (time.time() - ALERT_STATE_TTL_SECONDS, MAX_ALERTS_MEMORY)
+            ).fetchall()
+        except sqlite3.Error as e:
+            if DEBUG_MODE:
+                print(f"❌ Could not load alert state: {str(e)}")
+            return
+        
+        for symbol, kind, level, label, fired_price, last_fired, last_seen in reversed(rows):
+            alert_state["records"][AlertKey(symbol, kind, level)] = {
+                "label": label,
+                "level_price": level,
+                "fired_price": fired_price,
+                "last_fired": last_fired,
+                "last_seen": last_seen,
+            }
+    
+    if DEBUG_MODE:
+        print(f"📂 Restored {len(rows)} alert cooldowns from {ALERT_STATE_DB}")
+
+
+def get_alert_record(key):
+    """Return the cooldown record for an alert key, marking it as recently seen"""
+    load_alert_state()
+    with alert_state["lock"]:
+        record = alert_state["records"].get(key)
+        if record is not None:
+            record["last_seen"] = time.time()
+            alert_state["records"].move_to_end(key)
+            alert_state["touched"].add(key)
+        return record
+
+
+def record_alert_fired(key, label, fired_price):
+    """Put an alert key into cooldown"""
+    load_alert_state()
+    now = time.time()
+    with alert_state["lock"]:
+        alert_state["records"][key] = {
+            "label": label,
+            "level_price": key.level,
+            "fired_price": fired_price,
+            "last_fired": now,
+            "last_seen": now,
+        }
+        alert_state["records"].move_to_end(key)
+        
+        evicted = []
+        while len(alert_state["records"]) > MAX_ALERTS_MEMORY:
+            evicted.append(alert_state["records"].popitem(last=False)[0])
+        
+        write_alert_db(
+            "INSERT OR REPLACE INTO alert_state (symbol, kind, level, label, fired_price, last_fired, last_seen) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(key.symbol, key.kind, key.level, label, fired_price, now, now)]
+        )
+        write_alert_db("DELETE FROM alert_state WHERE symbol = ? AND kind = ? AND level = ?", evicted)
+
+
+def clear_alert(key):
+    """Take an alert key out of cooldown so it can fire again"""
+    with alert_state["lock"]:
+        removed = alert_state["records"].pop(key, None) is not None
+        alert_state["touched"].discard(key)
+        if removed:
+            write_alert_db("DELETE FROM alert_state WHERE symbol = ? AND kind = ? AND level = ?", [key])
+        return removed
+
+
+def count_active_alerts():
+    """Number of alert keys currently in cooldown"""
+    return len(alert_state["records"])
+
+
 def cleanup_old_alerts():
-    """Clean up old alerts to prevent memory bloat"""
-    if len(current_data["alerts_sent"]) > MAX_ALERTS_MEMORY:
-        alerts_list = list(current_data["alerts_sent"])
-        # Remove oldest half
-        alerts_to_remove = alerts_list[:len(alerts_list)//2]
-        for alert in alerts_to_remove:
-            current_data["alerts_sent"].discard(alert)
+    """Evict alerts not seen within the TTL or beyond the memory cap, and flush last-seen times to disk"""
+    load_alert_state()
+    cutoff = time.time() - ALERT_STATE_TTL_SECONDS
+    evicted = []
+    
+    with alert_state["lock"]:
+        records = alert_state["records"]
+        while records and (len(records) > MAX_ALERTS_MEMORY or next(iter(records.values()))["last_seen"] < cutoff):
+            evicted.append(records.popitem(last=False)[0])
         
-        if DEBUG_MODE:
-            print(f"🧹 Cleaned up {len(alerts_to_remove)} old alerts from memory")
+        # last_seen changes are batched here instead of written on every lookup
+        touched = [(records[key]["last_seen"],) + tuple(key) for key in alert_state["touched"] if key in records]
+        alert_state["touched"].clear()
+        
+        write_alert_db("DELETE FROM alert_state WHERE symbol = ? AND kind = ? AND level = ?", evicted)
+        write_alert_db("DELETE FROM alert_state WHERE last_seen < ?", [(cutoff,)])
+        write_alert_db("UPDATE alert_state SET last_seen = ? WHERE symbol = ? AND kind = ? AND level = ?", touched)
+    
+    if DEBUG_MODE and evicted:
+        print(f"🧹 Cleaned up {len(evicted)} old alerts from memory")
 
 
 # Initialize Dash App
@@ -383,7 +629,110 @@ app.index_string = '''
 '''
 
 # Global variables to store data
-current_data = {"df": None, "last_update": None, "alerts_sent": set()}
+current_data = {"df": None, "last_update": None}
+
+# Token buckets per upstream host. Callers reserve a token under the lock and sleep
+# outside it, so the same buckets serve worker threads and asyncio tasks alike.
+rate_limiters = {"buckets": {}, "lock": threading.Lock()}
+
+
+def get_rate_bucket(host):
+    """Return the token bucket governing a host (subdomains share their parent's), or None"""
+    host = (host or '').lower()
+    bucket = rate_limiters["buckets"].get(host)
+    if bucket is not None:
+        return bucket
+    
+    for limited_host, (rate, burst) in HOST_RATE_LIMITS.items():
+        if host == limited_host or host.endswith('.' + limited_host):
+            with rate_limiters["lock"]:
+                return rate_limiters["buckets"].setdefault(limited_host, {
+                    "rate": rate, "capacity": burst, "tokens": float(burst),
+                    "updated": time.monotonic(), "lock": threading.Lock(),
+                })
+    return None
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a host's token bucket stays empty for longer than RATE_LIMIT_MAX_WAIT_SECONDS"""
+
+
+def try_acquire_rate_limit(url):
+    """Take a token for the URL's host if one is available; otherwise return seconds until one is"""
+    bucket = get_rate_bucket(urlsplit(url).hostname)
+    if bucket is None:
+        return 0.0
+    
+    with bucket["lock"]:
+        now = time.monotonic()
+        bucket["tokens"] = min(bucket["capacity"], bucket["tokens"] + (now - bucket["updated"]) * bucket["rate"])
+        bucket["updated"] = now
+        if bucket["tokens"] >= 1:
+            bucket["tokens"] -= 1
+            return 0.0
+        # Nothing is reserved while waiting, so a caller that gives up (or is cancelled) costs no budget
+        return (1 - bucket["tokens"]) / bucket["rate"]
+
+
+def acquire_rate_limit(url):
+    """Block the calling thread until the URL's host has budget for one request"""
+    deadline = time.monotonic() + RATE_LIMIT_MAX_WAIT_SECONDS
+    while True:
+        wait = try_acquire_rate_limit(url)
+        if wait <= 0:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RateLimitTimeout(f"No rate-limit budget for {urlsplit(url).hostname} within {RATE_LIMIT_MAX_WAIT_SECONDS}s")
+        time.sleep(min(wait, remaining))
+
+
+async def acquire_rate_limit_async(url):
+    """Asyncio variant of acquire_rate_limit that yields instead of blocking"""
+    deadline = time.monotonic() + RATE_LIMIT_MAX_WAIT_SECONDS
+    while True:
+        wait = try_acquire_rate_limit(url)
+        if wait <= 0:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise RateLimitTimeout(f"No rate-limit budget for {urlsplit(url).hostname} within {RATE_LIMIT_MAX_WAIT_SECONDS}s")
+        await asyncio.sleep(min(wait, remaining))
+
+
+def throttled(url, func, *args, **kwargs):
+    """Call func after acquiring rate-limit budget for url (for calls that bypass our sessions)"""
+    acquire_rate_limit(url)
+    return func(*args, **kwargs)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a per-host token before every request it sends"""
+    
+    def send(self, request, **kwargs):
+        acquire_rate_limit(request.url)
+        return super().send(request, **kwargs)
+
+
+# Shared HTTP client layer: every outbound requests call goes through one of these sessions
+http_sessions = {}
+
+def mount_pooled_adapters(session, max_retries=0, pool_sizes=None):
+    """Mount a keep-alive pool sized per host, plus a default pool for any other host"""
+    default_adapter = RateLimitedAdapter(max_retries=max_retries, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+    
+    for host, size in (HOST_POOL_SIZES if pool_sizes is None else pool_sizes).items():
+        adapter = RateLimitedAdapter(max_retries=max_retries, pool_connections=1, pool_maxsize=size)
+        session.mount(f"https://{host}/", adapter)
+    
+    return session
+
+def register_session(name, session):
+    """Track a session so its connection pools show up in get_connection_pool_stats()"""
+    http_sessions[name] = session
+    return session
 
 # Enhanced connection functions with Railway-specific handling
 def create_robust_session():
@@ -411,67 +760,348 @@ def create_robust_session():
     session.verify = certifi.where()
     
     # Add retry strategy for Railway
-    from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
-    
     retry_strategy = Retry(
         total=3,
         backoff_factor=1,
         status_forcelist=[429, 500, 502, 503, 504, 451],
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    return session
+    return mount_pooled_adapters(session, max_retries=retry_strategy)
 
-# Global session for reuse
-robust_session = create_robust_session()
+def create_plain_session():
+    """Keep-alive session with minimal headers and no retries (OHLC klines, basic fallbacks)"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    session.verify = certifi.where()
+    return mount_pooled_adapters(session)
 
-def get_crypto_price_alternative_apis(symbol):
-    """Try multiple crypto APIs as fallbacks with Railway-specific handling"""
-    clean_symbol = symbol.replace('/', '').replace('-', '').upper()
+def create_telegram_session():
+    """Keep-alive session for the Telegram Bot API (retries are handled by the sender)"""
+    session = requests.Session()
+    session.verify = certifi.where()
+    return mount_pooled_adapters(session, pool_sizes={'api.telegram.org': HOST_POOL_SIZES.get('api.telegram.org', 2)})
+
+# Global sessions for reuse
+robust_session = register_session('robust', create_robust_session())
+plain_session = register_session('plain', create_plain_session())
+telegram_session = register_session('telegram', create_telegram_session())
+
+# Async price engine: one event loop thread owning a long-lived httpx client, so
+# connections (HTTP/2 when h2 is installed) survive from one refresh cycle to the next
+async_engine = {"loop": None, "thread": None, "client": None, "lock": threading.Lock(),
+                "stats": {"requests": 0, "http2": 0}}
+
+def get_async_loop():
+    """Start the async engine's event loop thread on first use"""
+    with async_engine["lock"]:
+        if async_engine["loop"] is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="async-http", daemon=True)
+            thread.start()
+            async_engine["loop"] = loop
+            async_engine["thread"] = thread
+        return async_engine["loop"]
+
+def run_async(coro):
+    """Run a coroutine on the async engine's loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, get_async_loop()).result()
+
+def get_async_client():
+    """Shared httpx.AsyncClient; must be called from the async engine's loop"""
+    if async_engine["client"] is None:
+        # httpx negotiates its own content encodings
+        headers = {k: v for k, v in robust_session.headers.items() if k.lower() != 'accept-encoding'}
+        stats = async_engine["stats"]
+        
+        async def throttle_request(request):
+            await acquire_rate_limit_async(str(request.url))
+        
+        async def count_response(response):
+            stats["requests"] += 1
+            if response.http_version == 'HTTP/2':
+                stats["http2"] += 1
+        
+        async_engine["client"] = httpx.AsyncClient(
+            headers=headers,
+            verify=certifi.where(),
+            follow_redirects=True,
+            http2=HTTP2_ENABLED and HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=sum(HOST_POOL_SIZES.values())),
+            event_hooks={'request': [throttle_request], 'response': [count_response]},
+        )
+    return async_engine["client"]
+
+def get_connection_pool_stats():
+    """Requests sent vs. connections opened per host across the shared sessions"""
+    hosts = {}
+    for session in list(http_sessions.values()):
+        adapters = {id(adapter): adapter for adapter in session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = hosts.setdefault(pool.host, {'requests': 0, 'connections': 0})
+                host['requests'] += pool.num_requests
+                host['connections'] += pool.num_connections
+    
+    total_requests = sum(host['requests'] for host in hosts.values())
+    total_connections = sum(host['connections'] for host in hosts.values())
+    reused = max(total_requests - total_connections, 0)
+    return {
+        'hosts': hosts,
+        'requests': total_requests,
+        'connections': total_connections,
+        'reuse_pct': (reused / total_requests * 100) if total_requests else 0.0,
+        'async_requests': async_engine["stats"]["requests"],
+        'async_http2': async_engine["stats"]["http2"],
+        'http2': HTTP2_ENABLED and HTTP2_AVAILABLE,
+    }
+
+def chunked(items, size):
+    """Split a list into consecutive chunks of at most size items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def clean_price_symbol(symbol):
+    """Normalize a sheet symbol to the bare ticker used by exchange APIs"""
+    return symbol.replace('/', '').replace('-', '').upper()
+
+
+def exchange_pair(symbol):
+    """USDT-margined exchange pair for a sheet symbol; 'btc', 'BTC' and 'BTCUSDT' all map to BTCUSDT"""
+    ticker = clean_price_symbol(symbol)
+    if ticker.endswith('USDT') and len(ticker) > 4:
+        ticker = ticker[:-4]
+    return ticker + 'USDT'
+
+
+# Circuit breakers keyed by provider name: closed → open after repeated outages →
+# half-open once the cool-off expires, letting a single probe decide
+provider_circuits = {"breakers": {}, "lock": threading.Lock()}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+def get_provider_circuit(name):
+    """Return (creating on first use) the breaker record for a provider; caller holds the lock"""
+    breaker = provider_circuits["breakers"].get(name)
+    if breaker is None:
+        breaker = {"state": "closed", "failures": 0, "opened_at": 0.0,
+                   "cooldown": CIRCUIT_COOLDOWN_SECONDS, "probe_started": None}
+        provider_circuits["breakers"][name] = breaker
+    return breaker
+
+
+def circuit_allows(name):
+    """True if a request to this provider may go out now"""
+    with provider_circuits["lock"]:
+        breaker = get_provider_circuit(name)
+        now = time.time()
+        
+        if breaker["state"] == "closed":
+            return True
+        
+        if breaker["state"] == "open":
+            if now - breaker["opened_at"] < breaker["cooldown"]:
+                return False
+            breaker["state"] = "half_open"
+            breaker["probe_started"] = now
+            if DEBUG_MODE:
+                print(f"🔌 {name} circuit half-open, probing...")
+            return True
+        
+        # Half-open: one probe at a time, but don't wait forever on a probe that never reported back
+        if breaker["probe_started"] is None or now - breaker["probe_started"] > breaker["cooldown"]:
+            breaker["probe_started"] = now
+            return True
+        return False
+
+
+def is_provider_outage(error):
+    """Connection errors, timeouts, 5xx, 451 and 429 count against a provider; unknown symbols do not"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, requests.exceptions.RetryError,
+                          httpx.TransportError)):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status is not None and (status >= 500 or status in (429, 451))
+
+
+def record_provider_result(name, error=None):
+    """Feed one call's outcome into the provider's breaker"""
+    outage = error is not None and is_provider_outage(error)
     
-    # API endpoints to try in order of preference (prioritizing non-blocked APIs)
-    apis = [
-        {
-            'name': 'CoinGecko',
-            'url': f'https://api.coingecko.com/api/v3/simple/price?ids={symbol.lower()}&vs_currencies=usd',
-            'parser': lambda r: float(list(r.json().values())[0]['usd'])
-        },
-        {
-            'name': 'CryptoCompare',
-            'url': f'https://min-api.cryptocompare.com/data/price?fsym={clean_symbol}&tsyms=USD',
-            'parser': lambda r: float(r.json()['USD'])
-        },
-        {
-            'name': 'CoinCap',
-            'url': f'https://api.coincap.io/v2/assets/{symbol.lower()}',
-            'parser': lambda r: float(r.json()['data']['priceUsd'])
-        },
-        {
-            'name': 'Binance Spot (with proxy headers)',
-            'url': f'https://api.binance.com/api/v3/ticker/price?symbol={clean_symbol}USDT',
-            'parser': lambda r: float(r.json()['price']),
-            'headers': {
-                'X-Forwarded-For': '127.0.0.1',
-                'X-Real-IP': '127.0.0.1',
-                'CF-Connecting-IP': '127.0.0.1'
-            }
-        },
-        {
-            'name': 'Binance Futures (with proxy headers)',
-            'url': f'https://fapi.binance.com/fapi/v1/ticker/price?symbol={clean_symbol}USDT',
-            'parser': lambda r: float(r.json()['price']),
-            'headers': {
-                'X-Forwarded-For': '127.0.0.1',
-                'X-Real-IP': '127.0.0.1',
-                'CF-Connecting-IP': '127.0.0.1'
+    with provider_circuits["lock"]:
+        breaker = get_provider_circuit(name)
+        
+        if not outage:
+            if breaker["state"] != "closed" and DEBUG_MODE:
+                print(f"✅ {name} circuit closed")
+            breaker.update(state="closed", failures=0, cooldown=CIRCUIT_COOLDOWN_SECONDS, probe_started=None)
+            return
+        
+        breaker["failures"] += 1
+        if breaker["state"] == "half_open":
+            breaker["cooldown"] = min(breaker["cooldown"] * 2, CIRCUIT_MAX_COOLDOWN_SECONDS)
+        elif breaker["state"] == "open" or breaker["failures"] < CIRCUIT_FAILURE_THRESHOLD:
+            return
+        
+        breaker.update(state="open", opened_at=time.time(), probe_started=None)
+        if DEBUG_MODE:
+            print(f"🚫 {name} circuit open for {breaker['cooldown']}s: {str(error)}")
+
+
+def release_circuit_probe(name):
+    """Let another caller probe when a half-open probe ended without a verdict (e.g. cancelled)"""
+    with provider_circuits["lock"]:
+        breaker = get_provider_circuit(name)
+        if breaker["state"] == "half_open":
+            breaker["probe_started"] = None
+
+
+def get_provider_circuit_stats():
+    """Snapshot of every provider breaker with the seconds left until its next probe"""
+    with provider_circuits["lock"]:
+        now = time.time()
+        return {
+            name: {
+                'state': breaker['state'],
+                'failures': breaker['failures'],
+                'retry_in': (max(breaker['opened_at'] + breaker['cooldown'] - now, 0)
+                             if breaker['state'] == 'open' else 0),
             }
+            for name, breaker in provider_circuits["breakers"].items()
         }
-    ]
+
+
+def parse_coingecko_price(response):
+    return float(list(response.json().values())[0]['usd'])
+
+def parse_cryptocompare_price(response):
+    return float(response.json()['USD'])
+
+def parse_coincap_price(response):
+    return float(response.json()['data']['priceUsd'])
+
+def parse_binance_price(response):
+    return float(response.json()['price'])
+
+BINANCE_PROXY_HEADERS = {
+    'X-Forwarded-For': '127.0.0.1',
+    'X-Real-IP': '127.0.0.1',
+    'CF-Connecting-IP': '127.0.0.1'
+}
+
+# Provider registry, built once. URL templates take {coin} (lowercase sheet symbol)
+# and {ticker} (cleaned exchange ticker); list order is the cold-start preference.
+PRICE_PROVIDERS = [
+    {
+        'name': 'CoinGecko',
+        'url': 'https://api.coingecko.com/api/v3/simple/price?ids={coin}&vs_currencies=usd',
+        'parser': parse_coingecko_price
+    },
+    {
+        'name': 'CryptoCompare',
+        'url': 'https://min-api.cryptocompare.com/data/price?fsym={ticker}&tsyms=USD',
+        'parser': parse_cryptocompare_price
+    },
+    {
+        'name': 'CoinCap',
+        'url': 'https://api.coincap.io/v2/assets/{coin}',
+        'parser': parse_coincap_price
+    },
+    {
+        'name': 'Binance Spot (with proxy headers)',
+        'url': 'https://api.binance.com/api/v3/ticker/price?symbol={ticker}USDT',
+        'parser': parse_binance_price,
+        'headers': BINANCE_PROXY_HEADERS
+    },
+    {
+        'name': 'Binance Futures (with proxy headers)',
+        'url': 'https://fapi.binance.com/fapi/v1/ticker/price?symbol={ticker}USDT',
+        'parser': parse_binance_price,
+        'headers': BINANCE_PROXY_HEADERS
+    }
+]
+
+
+def provider_url(api, symbol):
+    """Fill a registry URL template for one symbol"""
+    return api['url'].format(coin=symbol.lower(), ticker=clean_price_symbol(symbol))
+
+
+# Rolling provider statistics: {"latency", "success", "samples"} per provider, and per (provider, symbol)
+provider_stats = {"providers": {}, "symbols": OrderedDict(), "lock": threading.Lock()}
+
+
+def update_ewma_record(record, latency, success):
+    """Move a stats record toward the newest observation (the first one seeds it)"""
+    alpha = PROVIDER_STATS_ALPHA
+    if record["samples"] == 0:
+        record["latency"], record["success"] = latency, float(success)
+    else:
+        record["latency"] += alpha * (latency - record["latency"])
+        record["success"] += alpha * (float(success) - record["success"])
+    record["samples"] += 1
+    record["updated_at"] = time.time()
+
+
+def record_provider_attempt(name, symbol, latency, success):
+    """Fold one attempt (time spent, whether it produced a price) into the rolling stats"""
+    with provider_stats["lock"]:
+        providers, symbols = provider_stats["providers"], provider_stats["symbols"]
+        key = (name, symbol)
+        
+        for record in (providers.setdefault(name, {"latency": 0.0, "success": 1.0, "samples": 0}),
+                       symbols.setdefault(key, {"latency": 0.0, "success": 1.0, "samples": 0})):
+            update_ewma_record(record, latency, success)
+        
+        symbols.move_to_end(key)
+        while len(symbols) > PROVIDER_STATS_MAX_SYMBOLS:
+            symbols.popitem(last=False)
+
+
+def rank_price_providers(symbol):
+    """Registry order sorted by expected time-to-success (latency / success rate) for this symbol"""
+    with provider_stats["lock"]:
+        fresh_after = time.time() - PROVIDER_STATS_STALE_SECONDS
+        
+        def fresh(record):
+            return record if record and record["updated_at"] >= fresh_after else None
+        
+        def expected_cost(api):
+            provider = fresh(provider_stats["providers"].get(api['name']))
+            latency = provider["latency"] if provider else PROVIDER_DEFAULT_LATENCY
+            # Whether a provider lists a coin is per symbol; fall back to its overall rate
+            record = fresh(provider_stats["symbols"].get((api['name'], symbol))) or provider
+            success = record["success"] if record else 1.0
+            return latency / max(success, 0.01)
+        
+        # sorted() is stable, so unmeasured providers keep their registry order
+        return sorted(PRICE_PROVIDERS, key=expected_cost)
+
+
+def get_provider_stats():
+    """Snapshot of the per-provider rolling latency and success rate"""
+    with provider_stats["lock"]:
+        return {name: dict(record) for name, record in provider_stats["providers"].items()}
+
+
+def get_crypto_price_alternative_apis(symbol):
+    """Try multiple crypto APIs as fallbacks, fastest expected provider first"""
+    apis = rank_price_providers(symbol)
     
     for api in apis:
+        if not circuit_allows(api['name']):
+            if DEBUG_MODE:
+                print(f"⏭️ Skipping {api['name']} for {symbol} (circuit open)")
+            continue
+        
+        started = time.time()
         try:
             if DEBUG_MODE:
                 print(f"🔄 Trying {api['name']} for {symbol}...")
@@ -480,17 +1110,21 @@ def get_crypto_price_alternative_apis(symbol):
             if 'headers' in api:
                 headers.update(api['headers'])
             
-            response = robust_session.get(api['url'], timeout=15, headers=headers)
+            response = robust_session.get(provider_url(api, symbol), timeout=PROVIDER_TIMEOUT_SECONDS, headers=headers)
             
             # Handle 451 status (IP blocked)
             if response.status_code == 451:
                 if DEBUG_MODE:
                     print(f"🚫 {api['name']} blocked (451) for {symbol}")
+                record_provider_attempt(api['name'], symbol, time.time() - started, False)
+                record_provider_result(api['name'], requests.HTTPError("451 blocked", response=response))
                 continue
             
             response.raise_for_status()
             
             price = api['parser'](response)
+            record_provider_attempt(api['name'], symbol, time.time() - started, True)
+            record_provider_result(api['name'])
             
             if DEBUG_MODE:
                 print(f"✅ {api['name']} success: {symbol} = ${price}")
@@ -498,213 +1132,674 @@ def get_crypto_price_alternative_apis(symbol):
             return price
             
         except Exception as e:
+            record_provider_attempt(api['name'], symbol, time.time() - started, False)
+            record_provider_result(api['name'], e)
             if DEBUG_MODE:
                 print(f"❌ {api['name']} failed for {symbol}: {str(e)}")
             continue
     
     return None
 
-@rate_limit(calls_per_second=2)  # More conservative rate limiting for Railway
-def get_multiple_prices_enhanced(symbols):
-    """Enhanced price fetching with multiple fallback APIs and Railway-specific handling"""
-    price_dict = {}
-    
-    # Try CoinGecko first (usually works on Railway)
+# Symbol → CoinGecko coin-id index, built from /coins/list and refreshed on a long TTL
+coingecko_index = {"index": None, "fetched_at": 0.0, "lock": threading.Lock()}
+
+
+def build_coingecko_index(coins_list):
+    """Map lowercase ids and symbols to candidate coin ids, in /coins/list order"""
+    index = {}
+    for coin in coins_list:
+        coin_id = coin.get('id')
+        if not coin_id:
+            continue
+        for key in (coin_id, (coin.get('symbol') or '').lower()):
+            if not key:
+                continue
+            candidates = index.setdefault(key, [])
+            if coin_id not in candidates:
+                candidates.append(coin_id)
+    return index
+
+
+def load_coingecko_index_from_disk():
+    """Load the persisted coin-id index, returning (index, fetched_at) or (None, 0)"""
     try:
+        with open(COINGECKO_INDEX_PATH, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        return payload['index'], float(payload['fetched_at'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, 0.0
+
+
+def save_coingecko_index_to_disk(index, fetched_at):
+    """Atomically persist the coin-id index as compact JSON"""
+    try:
+        directory = os.path.dirname(COINGECKO_INDEX_PATH) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': fetched_at, 'index': index}, f, separators=(',', ':'))
+        os.replace(tmp_path, COINGECKO_INDEX_PATH)
+    except OSError as e:
         if DEBUG_MODE:
-            print("🔄 Attempting CoinGecko batch request...")
-        
-        # Get all available coins from CoinGecko
-        response = robust_session.get('https://api.coingecko.com/api/v3/coins/list', timeout=15)
-        if response.status_code == 200:
-            coins_list = response.json()
-            
-            for symbol in symbols:
-                # Try to find matching coin
-                symbol_lower = symbol.lower()
-                for coin in coins_list:
-                    if coin['id'] == symbol_lower or coin['symbol'] == symbol_lower:
-                        try:
-                            price_response = robust_session.get(
-                                f"https://api.coingecko.com/api/v3/simple/price?ids={coin['id']}&vs_currencies=usd",
-                                timeout=10
-                            )
-                            if price_response.status_code == 200:
-                                price_data = price_response.json()
-                                if coin['id'] in price_data and 'usd' in price_data[coin['id']]:
-                                    price_dict[symbol] = price_data[coin['id']]['usd']
-                                    break
-                        except:
-                            continue
-                
-                # If not found in CoinGecko, try individual API
-                if symbol not in price_dict:
-                    price = get_crypto_price_alternative_apis(symbol)
-                    if price:
-                        price_dict[symbol] = price
-                    else:
-                        price_dict[symbol] = None
-                        
-                time.sleep(0.5)  # Rate limiting between requests
-                
-    except Exception as e:
-        if DEBUG_MODE:
-            print(f"❌ CoinGecko batch failed: {str(e)}")
-    
-    # Fill in missing symbols with individual requests
-    missing_symbols = [s for s in symbols if s not in price_dict]
-    
-    if missing_symbols:
-        if DEBUG_MODE:
-            print(f"🔄 Fetching {len(missing_symbols)} symbols individually...")
-        
-        for symbol in missing_symbols:
-            try:
-                price = get_crypto_price_alternative_apis(symbol)
-                if price:
-                    price_dict[symbol] = price
-                else:
-                    price_dict[symbol] = None
-                time.sleep(1)  # More conservative delay for Railway
-            except Exception as e:
-                if DEBUG_MODE:
-                    print(f"❌ Individual fetch failed for {symbol}: {str(e)}")
-                price_dict[symbol] = None
-    
-    return price_dict
+            print(f"❌ Could not persist CoinGecko index: {str(e)}")
+
+
+def get_coingecko_index():
+    """Return the coin-id index, rebuilding it from /coins/list only when the TTL expired"""
+    with coingecko_index["lock"]:
+        now = time.time()
+        if coingecko_index["index"] is not None and now - coingecko_index["fetched_at"] < COINGECKO_INDEX_TTL_SECONDS:
+            return coingecko_index["index"]
+
+        if coingecko_index["index"] is None:
+            index, fetched_at = load_coingecko_index_from_disk()
+            if index is not None:
+                coingecko_index["index"], coingecko_index["fetched_at"] = index, fetched_at
+                if now - fetched_at < COINGECKO_INDEX_TTL_SECONDS:
+                    if DEBUG_MODE:
+                        print(f"📂 Loaded CoinGecko index from disk: {len(index)} keys")
+                    return index
 
-def load_sheet_data_enhanced(url):
-    """Enhanced CSV loading with multiple methods and Railway-specific handling"""
-    methods = [
-        {
-            'name': 'Pandas with enhanced headers',
-            'method': lambda: pd.read_csv(url, storage_options={
-                'User-Agent': robust_session.headers['User-Agent'],
-                'headers': {
-                    'X-Forwarded-For': '127.0.0.1',
-                    'X-Real-IP': '127.0.0.1'
-                }
-            })
-        },
-        {
-            'name': 'Requests with enhanced headers',
-            'method': lambda: pd.read_csv(io.StringIO(
-                robust_session.get(url, timeout=20, headers={
-                    'X-Forwarded-For': '127.0.0.1',
-                    'X-Real-IP': '127.0.0.1'
-                }).text
-            ))
-        },
-        {
-            'name': 'urllib with enhanced headers',
-            'method': lambda: pd.read_csv(urllib.request.urlopen(
-                urllib.request.Request(url, headers={
-                    'User-Agent': robust_session.headers['User-Agent'],
-                    'X-Forwarded-For': '127.0.0.1',
-                    'X-Real-IP': '127.0.0.1'
-                })
-            ))
-        },
-        {
-            'name': 'Direct pandas (fallback)',
-            'method': lambda: pd.read_csv(url)
-        }
-    ]
-    
-    for method in methods:
         try:
             if DEBUG_MODE:
-                print(f"🔄 Trying CSV load method: {method['name']}")
-            
-            df = method['method']()
-            
+                print("🔄 Refreshing CoinGecko coin-id index...")
+            response = robust_session.get('https://api.coingecko.com/api/v3/coins/list', timeout=15)
+            response.raise_for_status()
+            index = build_coingecko_index(response.json())
+            coingecko_index["index"], coingecko_index["fetched_at"] = index, now
+            save_coingecko_index_to_disk(index, now)
             if DEBUG_MODE:
-                print(f"✅ CSV loaded successfully with {method['name']}: {len(df)} rows")
-            
-            return df, None
-            
+                print(f"✅ CoinGecko index rebuilt: {len(index)} keys")
         except Exception as e:
+            # Keep serving a stale index rather than none at all
             if DEBUG_MODE:
-                print(f"❌ CSV method {method['name']} failed: {str(e)}")
-            continue
-    
-    return None, "All CSV loading methods failed"
+                print(f"❌ CoinGecko index refresh failed: {str(e)}")
 
-def check_connection_health_enhanced():
-    """Enhanced connection health check with Railway-specific diagnostics"""
-    health_status = {
-        'csv_accessible': False,
-        'binance_spot_accessible': False,
-        'binance_futures_accessible': False,
-        'coingecko_accessible': False,
-        'cryptocompare_accessible': False,
-        'telegram_accessible': False,
-        'dns_resolution': False
-    }
+        return coingecko_index["index"]
+
+
+def resolve_coingecko_ids(symbol, index=None):
+    """Return the candidate CoinGecko coin ids for a sheet symbol (O(1) lookup)"""
+    if index is None:
+        index = get_coingecko_index()
+    if not index:
+        return []
+    return index.get(str(symbol).lower(), [])
+
+
+async def fetch_provider_price_async(client, api, symbol, semaphores):
+    """Fetch one symbol from one provider, bounded by that provider's semaphore"""
+    async with semaphores[api['name']]:
+        # Checked after queueing so symbols waiting on the semaphore see a breaker that just opened
+        if not circuit_allows(api['name']):
+            raise CircuitOpenError(f"{api['name']} circuit open")
+        
+        started = time.time()
+        try:
+            if DEBUG_MODE:
+                print(f"🔄 [async] Trying {api['name']} for {symbol}...")
+            response = await client.get(provider_url(api, symbol), headers=api.get('headers'),
+                                        timeout=PROVIDER_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            price = api['parser'](response)
+        except asyncio.CancelledError:
+            release_circuit_probe(api['name'])
+            raise
+        except Exception as e:
+            record_provider_attempt(api['name'], symbol, time.time() - started, False)
+            record_provider_result(api['name'], e)
+            raise
     
-    # Test DNS resolution
+    record_provider_attempt(api['name'], symbol, time.time() - started, True)
+    record_provider_result(api['name'])
+    return price
+
+
+async def race_providers_async(client, apis, symbol, semaphores):
+    """Hedged request: start the top provider, then the runner-up after a short delay; first price wins"""
+    tasks = []
     try:
-        socket.gethostbyname('google.com')
-        health_status['dns_resolution'] = True
-    except:
-        pass
-    
-    # Test various APIs with Railway-specific handling
-    test_endpoints = [
-        ('csv_accessible', CSV_URL, 'HEAD'),
-        ('coingecko_accessible', 'https://api.coingecko.com/api/v3/ping', 'GET'),
-        ('cryptocompare_accessible', 'https://min-api.cryptocompare.com/data/price?fsym=BTC&tsyms=USD', 'GET'),
-        ('telegram_accessible', f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getMe", 'GET')
-    ]
+        for position, api in enumerate(apis):
+            tasks.append(asyncio.create_task(fetch_provider_price_async(client, api, symbol, semaphores)))
+            
+            # Give the preferred provider a head start before hedging with the next one
+            if position < len(apis) - 1 and PRICE_HEDGE_DELAY_SECONDS > 0:
+                done, _ = await asyncio.wait(tasks, timeout=PRICE_HEDGE_DELAY_SECONDS)
+                for task in done:
+                    if not task.exception() and task.result():
+                        return task.result()
+        
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.exception() and task.result():
+                    return task.result()
+        return None
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def fetch_symbol_price_async(client, symbol, semaphores):
+    """Walk the ranked provider list for one symbol, racing the top two providers when hedging is on"""
+    apis = rank_price_providers(symbol)
     
-    # Test Binance APIs with enhanced headers
-    binance_endpoints = [
-        ('binance_spot_accessible', 'https://api.binance.com/api/v3/ping', 'GET'),
-        ('binance_futures_accessible', 'https://fapi.binance.com/fapi/v1/ping', 'GET')
-    ]
+    if PRICE_HEDGING and len(apis) >= 2:
+        price = await race_providers_async(client, apis[:2], symbol, semaphores)
+        if price:
+            return price
+        apis = apis[2:]
     
-    for key, url, method in test_endpoints:
+    for api in apis:
         try:
-            if method == 'HEAD':
-                response = robust_session.head(url, timeout=15)
-            else:
-                response = robust_session.get(url, timeout=15)
-            
-            health_status[key] = response.status_code in [200, 201]
-            
-            if DEBUG_MODE:
-                print(f"{'✅' if health_status[key] else '❌'} {key}: {response.status_code}")
-                
+            price = await fetch_provider_price_async(client, api, symbol, semaphores)
+            if price:
+                if DEBUG_MODE:
+                    print(f"✅ [async] {api['name']} success: {symbol} = ${price}")
+                return price
         except Exception as e:
             if DEBUG_MODE:
-                print(f"❌ {key} failed: {str(e)}")
-            health_status[key] = False
+                print(f"❌ [async] {api['name']} failed for {symbol}: {str(e)}")
+    
+    return None
+
+
+async def fetch_prices_async(symbols):
+    """Fan out per-symbol lookups concurrently with per-provider concurrency limits"""
+    semaphores = {
+        api['name']: asyncio.Semaphore(PROVIDER_CONCURRENCY.get(api['name'], DEFAULT_PROVIDER_CONCURRENCY))
+        for api in PRICE_PROVIDERS
+    }
+    client = get_async_client()
+    results = await asyncio.gather(
+        *(fetch_symbol_price_async(client, symbol, semaphores) for symbol in symbols),
+        return_exceptions=True
+    )
+    
+    return {
+        symbol: (None if isinstance(result, BaseException) else result)
+        for symbol, result in zip(symbols, results)
+    }
+
+
+def get_prices_concurrently(symbols):
+    """Synchronous entry point for the async price engine"""
+    return run_async(fetch_prices_async(list(symbols)))
+
+
+def fetch_coingecko_prices_batch(coin_ids):
+    """Fetch USD prices for many CoinGecko ids with chunked comma-separated requests"""
+    prices = {}
     
-    # Test Binance with enhanced headers
-    for key, url, method in binance_endpoints:
+    for chunk in chunked(list(dict.fromkeys(coin_ids)), COINGECKO_BATCH_SIZE):
+        if not circuit_allows('CoinGecko'):
+            if DEBUG_MODE:
+                print("⏭️ Skipping CoinGecko batch (circuit open)")
+            break
         try:
-            headers = robust_session.headers.copy()
-            headers.update({
-                'X-Forwarded-For': '127.0.0.1',
-                'X-Real-IP': '127.0.0.1',
-                'CF-Connecting-IP': '127.0.0.1'
-            })
-            
-            response = robust_session.get(url, timeout=15, headers=headers)
+            response = robust_session.get(
+                'https://api.coingecko.com/api/v3/simple/price',
+                params={'ids': ','.join(chunk), 'vs_currencies': 'usd'},
+                timeout=15
+            )
+            response.raise_for_status()
             
-            # Consider 451 as "accessible but blocked" rather than failed
-            health_status[key] = response.status_code in [200, 201, 451]
+            for coin_id, data in response.json().items():
+                if isinstance(data, dict) and data.get('usd') is not None:
+                    prices[coin_id] = float(data['usd'])
+            record_provider_result('CoinGecko')
+        except Exception as e:
+            record_provider_result('CoinGecko', e)
+            if DEBUG_MODE:
+                print(f"❌ CoinGecko batch of {len(chunk)} ids failed: {str(e)}")
+    
+    return prices
+
+
+def fetch_cryptocompare_prices_batch(symbols):
+    """Fetch USD prices for many symbols with chunked CryptoCompare pricemulti requests"""
+    prices = {}
+    by_ticker = {}
+    for symbol in symbols:
+        by_ticker.setdefault(clean_price_symbol(symbol), []).append(symbol)
+    
+    # pricemulti limits the length of the fsyms list, so chunk by characters
+    chunks, current = [], []
+    for ticker in by_ticker:
+        if current and len(','.join(current + [ticker])) > CRYPTOCOMPARE_FSYMS_MAX_CHARS:
+            chunks.append(current)
+            current = []
+        current.append(ticker)
+    if current:
+        chunks.append(current)
+    
+    for chunk in chunks:
+        if not circuit_allows('CryptoCompare'):
+            if DEBUG_MODE:
+                print("⏭️ Skipping CryptoCompare batch (circuit open)")
+            break
+        try:
+            response = robust_session.get(
+                'https://min-api.cryptocompare.com/data/pricemulti',
+                params={'fsyms': ','.join(chunk), 'tsyms': 'USD'},
+                timeout=15
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            for ticker in chunk:
+                quote = data.get(ticker)
+                if isinstance(quote, dict) and quote.get('USD'):
+                    for symbol in by_ticker[ticker]:
+                        prices[symbol] = float(quote['USD'])
+            record_provider_result('CryptoCompare')
+        except Exception as e:
+            record_provider_result('CryptoCompare', e)
+            if DEBUG_MODE:
+                print(f"❌ CryptoCompare batch of {len(chunk)} symbols failed: {str(e)}")
+    
+    return prices
+
+
+# Symbols that no provider could price, keyed by symbol: misses, first/last check and next re-check time
+unresolved_symbols = {"symbols": {}, "lock": threading.Lock()}
+
+
+def split_unresolved_symbols(symbols):
+    """Split symbols into (to_fetch, skipped) where skipped are negative-cached and not yet due"""
+    now = time.time()
+    to_fetch, skipped = [], []
+    with unresolved_symbols["lock"]:
+        entries = unresolved_symbols["symbols"]
+        for symbol in symbols:
+            entry = entries.get(symbol)
+            if entry is not None:
+                entry["last_requested"] = now
+            (skipped if entry is not None and now < entry["next_check"] else to_fetch).append(symbol)
+        
+        # Forget symbols that have left the sheet
+        for symbol in [s for s, entry in entries.items() if now - entry["last_requested"] > UNRESOLVED_MAX_RECHECK_SECONDS * 2]:
+            del entries[symbol]
+    
+    return to_fetch, skipped
+
+
+def record_unresolved_results(symbols, price_dict):
+    """Clear symbols that got a price and back off the re-check of those that did not"""
+    # With no price at all the providers are down, which says nothing about the symbols
+    if not any(price_dict.get(symbol) for symbol in symbols):
+        return
+    
+    now = time.time()
+    with unresolved_symbols["lock"]:
+        entries = unresolved_symbols["symbols"]
+        for symbol in symbols:
+            if price_dict.get(symbol):
+                if entries.pop(symbol, None) is not None and DEBUG_MODE:
+                    print(f"✅ {symbol} resolved again")
+                continue
             
+            entry = entries.setdefault(symbol, {"misses": 0, "first_seen": now})
+            entry["misses"] += 1
+            entry["last_checked"] = entry["last_requested"] = now
+            delay = min(UNRESOLVED_RECHECK_SECONDS * 2 ** (entry["misses"] - 1), UNRESOLVED_MAX_RECHECK_SECONDS)
+            entry["next_check"] = now + delay
+            if DEBUG_MODE:
+                print(f"❓ {symbol} unresolved ({entry['misses']} misses), re-check in {delay}s")
+
+
+def get_unresolved_symbols():
+    """Negative-cached symbols, most misses first, with seconds until their next re-check"""
+    now = time.time()
+    with unresolved_symbols["lock"]:
+        return sorted(
+            ({
+                'symbol': symbol,
+                'misses': entry['misses'],
+                'first_seen': datetime.fromtimestamp(entry['first_seen']),
+                'recheck_in': max(entry['next_check'] - now, 0),
+            } for symbol, entry in unresolved_symbols["symbols"].items()),
+            key=lambda item: (-item['misses'], item['symbol'])
+        )
+
+
+# Binance all-symbols ticker endpoints (no symbol parameter), futures first like the OHLC data.
+# Named after the per-symbol providers so both share a circuit breaker.
+BINANCE_BULK_TICKERS = [
+    ('Binance Futures (with proxy headers)', 'https://fapi.binance.com/fapi/v1/ticker/price'),
+    ('Binance Spot (with proxy headers)', 'https://api.binance.com/api/v3/ticker/price'),
+]
+
+binance_tickers = {"tables": {}, "lock": threading.Lock()}
+
+
+def get_binance_ticker_table(name, url):
+    """Pair → price for every Binance symbol, fetched in one request and cached for BINANCE_TICKER_TTL_SECONDS"""
+    with binance_tickers["lock"]:
+        cached = binance_tickers["tables"].get(name)
+        if cached is not None and time.time() - cached["fetched_at"] < BINANCE_TICKER_TTL_SECONDS:
+            return cached["prices"]
+        
+        if not circuit_allows(name):
             if DEBUG_MODE:
-                status_emoji = "✅" if health_status[key] else "❌"
-                print(f"{status_emoji} {key}: {response.status_code}")
+                print(f"⏭️ Skipping {name} bulk ticker (circuit open)")
+            return {}
+        
+        try:
+            response = robust_session.get(url, headers=BINANCE_PROXY_HEADERS, timeout=15)
+            response.raise_for_status()
+            prices = {
+                ticker['symbol']: float(ticker['price'])
+                for ticker in response.json()
+                if isinstance(ticker, dict) and ticker.get('symbol') and ticker.get('price')
+            }
+            record_provider_result(name)
+        except Exception as e:
+            record_provider_result(name, e)
+            if DEBUG_MODE:
+                print(f"❌ {name} bulk ticker failed: {str(e)}")
+            # Don't retry within the same cycle; stale prices are not served either
+            prices = {}
+        
+        binance_tickers["tables"][name] = {"prices": prices, "fetched_at": time.time()}
+        return prices
+
+
+def fetch_binance_prices_bulk(symbols):
+    """Serve symbols from Binance's all-symbols tickers (futures, then spot for the rest)"""
+    prices = {}
+    
+    for name, url in BINANCE_BULK_TICKERS:
+        remaining = [symbol for symbol in symbols if symbol not in prices]
+        if not remaining:
+            break
+        
+        table = get_binance_ticker_table(name, url)
+        for symbol in remaining:
+            price = table.get(clean_price_symbol(symbol) + 'USDT')
+            if price:
+                prices[symbol] = price
+    
+    return prices
+
+
+def get_multiple_prices_enhanced(symbols):
+    """Batched price fetching: Binance, CoinGecko and CryptoCompare in bulk, then per-symbol fallbacks"""
+    symbols, skipped = split_unresolved_symbols(list(dict.fromkeys(symbols)))
+    price_dict = {symbol: None for symbol in skipped}
+    if skipped and DEBUG_MODE:
+        print(f"⏭️ Skipping {len(skipped)} unresolved symbols until their re-check")
+    
+    # Streaming mode: fresh ticks need no request; stale or unstreamed symbols fall through to REST
+    if STREAMING_MODE:
+        streamed = get_streamed_prices(symbols)
+        if streamed and DEBUG_MODE:
+            print(f"📡 {len(streamed)} prices from the stream")
+        price_dict.update(streamed)
+    
+    # Binance all-symbols tickers: one request each serves every listed pair
+    missing_symbols = [s for s in symbols if s not in price_dict]
+    
+    if missing_symbols:
+        if DEBUG_MODE:
+            print(f"🔄 Attempting Binance bulk ticker for {len(missing_symbols)} symbols...")
+        price_dict.update(fetch_binance_prices_bulk(missing_symbols))
+    
+    # CoinGecko next (usually works on Railway)
+    missing_symbols = [s for s in symbols if s not in price_dict]
+    
+    try:
+        if DEBUG_MODE:
+            print(f"🔄 Attempting CoinGecko batch request for {len(missing_symbols)} symbols...")
+        
+        index = get_coingecko_index() if missing_symbols else None
+        if index:
+            candidates = {symbol: resolve_coingecko_ids(symbol, index) for symbol in missing_symbols}
+            coin_prices = fetch_coingecko_prices_batch(
+                [coin_id for ids in candidates.values() for coin_id in ids]
+            )
+            
+            # Keep the first candidate (in /coins/list order) that has a price
+            for symbol, ids in candidates.items():
+                for coin_id in ids:
+                    if coin_id in coin_prices:
+                        price_dict[symbol] = coin_prices[coin_id]
+                        break
                 
+    except Exception as e:
+        if DEBUG_MODE:
+            print(f"❌ CoinGecko batch failed: {str(e)}")
+    
+    # CryptoCompare pricemulti for whatever CoinGecko could not price
+    missing_symbols = [s for s in symbols if s not in price_dict]
+    
+    if missing_symbols:
+        if DEBUG_MODE:
+            print(f"🔄 Attempting CryptoCompare batch request for {len(missing_symbols)} symbols...")
+        price_dict.update(fetch_cryptocompare_prices_batch(missing_symbols))
+    
+    # Fill in missing symbols with individual requests
+    missing_symbols = [s for s in symbols if s not in price_dict]
+    
+    if missing_symbols:
+        if DEBUG_MODE:
+            print(f"🔄 Fetching {len(missing_symbols)} symbols individually...")
+        
+        if ASYNC_PRICE_FETCH:
+            try:
+                price_dict.update(get_prices_concurrently(missing_symbols))
+            except Exception as e:
+                if DEBUG_MODE:
+                    print(f"❌ Concurrent fetch failed, falling back to serial: {str(e)}")
+        
+        for symbol in [s for s in missing_symbols if s not in price_dict]:
+            try:
+                price = get_crypto_price_alternative_apis(symbol)
+                if price:
+                    price_dict[symbol] = price
+                else:
+                    price_dict[symbol] = None
+            except Exception as e:
+                if DEBUG_MODE:
+                    print(f"❌ Individual fetch failed for {symbol}: {str(e)}")
+                price_dict[symbol] = None
+    
+    record_unresolved_results(symbols, price_dict)
+    return price_dict
+
+# Per-loader memory of the last successful CSV method plus per-method counters
+csv_method_stats = {"loaders": {}, "lock": threading.Lock()}
+
+
+def order_csv_methods(loader, methods):
+    """Put the loader's last successful method first until its memory expires"""
+    with csv_method_stats["lock"]:
+        state = csv_method_stats["loaders"].get(loader)
+        if not state or not state["preferred"]:
+            return list(methods)
+        if time.time() - state["preferred_since"] >= CSV_METHOD_REPROBE_SECONDS:
+            # Memory expired: walk the default order once so a recovered method can win again
+            return list(methods)
+        preferred = state["preferred"]
+    
+    return sorted(methods, key=lambda method: method[0] != preferred)
+
+
+def record_csv_method_result(loader, method_name, success, latency, error=None):
+    """Update success/latency counters and the preferred method for a CSV loader"""
+    with csv_method_stats["lock"]:
+        state = csv_method_stats["loaders"].setdefault(
+            loader, {"preferred": None, "preferred_since": 0.0, "methods": {}}
+        )
+        stats = state["methods"].setdefault(method_name, {
+            "attempts": 0, "successes": 0, "failures": 0,
+            "total_latency": 0.0, "last_latency": None, "last_error": None
+        })
+        stats["attempts"] += 1
+        stats["total_latency"] += latency
+        stats["last_latency"] = latency
+        
+        if success:
+            stats["successes"] += 1
+            now = time.time()
+            if state["preferred"] != method_name or now - state["preferred_since"] >= CSV_METHOD_REPROBE_SECONDS:
+                state["preferred"] = method_name
+                state["preferred_since"] = now
+        else:
+            stats["failures"] += 1
+            stats["last_error"] = str(error)[:100] if error else None
+
+
+def get_csv_method_stats():
+    """Per-loader success rate and latency counters for every CSV method tried"""
+    with csv_method_stats["lock"]:
+        report = {}
+        for loader, state in csv_method_stats["loaders"].items():
+            report[loader] = {
+                "preferred": state["preferred"],
+                "methods": {
+                    name: {
+                        "attempts": stats["attempts"],
+                        "success_rate": stats["successes"] / stats["attempts"] if stats["attempts"] else None,
+                        "avg_latency": stats["total_latency"] / stats["attempts"] if stats["attempts"] else None,
+                        "last_latency": stats["last_latency"],
+                        "last_error": stats["last_error"],
+                    }
+                    for name, stats in state["methods"].items()
+                },
+            }
+        return report
+
+
+def run_csv_methods(loader, methods):
+    """Try CSV methods (preferred first), recording the outcome of each attempt"""
+    for method_name, method_func in order_csv_methods(loader, methods):
+        started = time.time()
+        try:
+            if DEBUG_MODE:
+                print(f"🔄 Trying CSV method: {method_name}")
+            df = method_func()
+            record_csv_method_result(loader, method_name, True, time.time() - started)
+            if DEBUG_MODE:
+                print(f"✅ Success with {method_name}: {len(df)} rows loaded")
+            return df, None
         except Exception as e:
+            record_csv_method_result(loader, method_name, False, time.time() - started, e)
             if DEBUG_MODE:
-                print(f"❌ {key} failed: {str(e)}")
-            health_status[key] = False
+                print(f"❌ {method_name} failed: {str(e)}")
+            continue
+    
+    return None, "All CSV loading methods failed"
+
+
+def load_sheet_data_enhanced(url):
+    """Enhanced CSV loading with multiple methods and Railway-specific handling"""
+    methods = [
+        {
+            'name': 'Pandas with enhanced headers',
+            'method': lambda: throttled(url, pd.read_csv, url, storage_options={
+                'User-Agent': robust_session.headers['User-Agent'],
+                'headers': {
+                    'X-Forwarded-For': '127.0.0.1',
+                    'X-Real-IP': '127.0.0.1'
+                }
+            })
+        },
+        {
+            'name': 'Requests with enhanced headers',
+            'method': lambda: pd.read_csv(io.StringIO(
+                robust_session.get(url, timeout=20, headers={
+                    'X-Forwarded-For': '127.0.0.1',
+                    'X-Real-IP': '127.0.0.1'
+                }).text
+            ))
+        },
+        {
+            'name': 'urllib with enhanced headers',
+            'method': lambda: pd.read_csv(throttled(url, urllib.request.urlopen,
+                urllib.request.Request(url, headers={
+                    'User-Agent': robust_session.headers['User-Agent'],
+                    'X-Forwarded-For': '127.0.0.1',
+                    'X-Real-IP': '127.0.0.1'
+                })
+            ))
+        },
+        {
+            'name': 'Direct pandas (fallback)',
+            'method': lambda: throttled(url, pd.read_csv, url)
+        }
+    ]
+    
+    return run_csv_methods('load_sheet_data_enhanced', [(method['name'], method['method']) for method in methods])
+
+def probe_dns():
+    """Health probe: DNS resolution works"""
+    socket.gethostbyname('google.com')
+    return True
+
+
+def probe_http(url, method='GET', ok_statuses=(200, 201), headers=None):
+    """Health probe: an endpoint answers with one of the expected status codes"""
+    request_headers = robust_session.headers.copy()
+    if headers:
+        request_headers.update(headers)
+    
+    response = robust_session.request(method, url, timeout=15, headers=request_headers)
+    return response.status_code in ok_statuses
+
+
+def get_health_probes():
+    """Named health probes, in display order"""
+    binance_headers = {
+        'X-Forwarded-For': '127.0.0.1',
+        'X-Real-IP': '127.0.0.1',
+        'CF-Connecting-IP': '127.0.0.1'
+    }
+    
+    return [
+        ('csv_accessible', lambda: probe_http(CSV_URL, 'HEAD')),
+        # Consider 451 as "accessible but blocked" rather than failed
+        ('binance_spot_accessible', lambda: probe_http(
+            'https://api.binance.com/api/v3/ping', ok_statuses=(200, 201, 451), headers=binance_headers)),
+        ('binance_futures_accessible', lambda: probe_http(
+            'https://fapi.binance.com/fapi/v1/ping', ok_statuses=(200, 201, 451), headers=binance_headers)),
+        ('coingecko_accessible', lambda: probe_http('https://api.coingecko.com/api/v3/ping')),
+        ('cryptocompare_accessible', lambda: probe_http(
+            'https://min-api.cryptocompare.com/data/price?fsym=BTC&tsyms=USD')),
+        ('telegram_accessible', lambda: probe_http(f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getMe")),
+        ('dns_resolution', probe_dns),
+    ]
+
+
+def run_health_probe(key, probe):
+    """Run one probe, capturing its outcome, latency and check time"""
+    started = time.time()
+    try:
+        ok, error = bool(probe()), None
+    except Exception as e:
+        ok, error = False, str(e)[:100]
+    
+    result = {'ok': ok, 'latency': time.time() - started, 'checked_at': datetime.now(), 'error': error}
+    
+    if DEBUG_MODE:
+        print(f"{'✅' if ok else '❌'} {key}: {result['latency']:.2f}s{' - ' + error if error else ''}")
     
-    return health_status
+    return result
+
+
+def run_health_probes():
+    """Run every health probe concurrently and return detailed results"""
+    probes = get_health_probes()
+    with ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix='health-probe') as executor:
+        futures = {key: executor.submit(run_health_probe, key, probe) for key, probe in probes}
+        return {key: future.result() for key, future in futures.items()}
+
+
+def check_connection_health_enhanced():
+    """Enhanced connection health check with Railway-specific diagnostics"""
+    return {key: result['ok'] for key, result in run_health_probes().items()}
+
 
 def run_network_diagnostics():
     """Run comprehensive network diagnostics with Railway-specific checks"""
@@ -766,9 +1861,10 @@ def run_network_diagnostics():
 app.layout = html.Div([
     
     dcc.Store(id='data-store'),
+    dcc.Store(id='table-store'),
     dcc.Interval(
         id='interval-component',
-        interval=30*1000,  # Update every 30 seconds
+        interval=REFRESH_INTERVAL_SECONDS*1000,  # Re-render the latest snapshot every refresh period
         n_intervals=0
     ),
     
@@ -801,8 +1897,60 @@ app.layout = html.Div([
         # Status Section
         html.Div(id='status-section', className='status-section'),
         
-        # Main Dashboard Content
-        html.Div(id='dashboard-content'),
+        # Main Dashboard Content: static table whose pages are served by update_results_table
+        html.Div([
+            html.Div(id='dashboard-message'),
+            html.Div(id='summary-cards', className='summary-cards'),
+            html.Div([
+                html.Div("Trading Dashboard", className='table-header'),
+                dash_table.DataTable(
+                    id='results-table',
+                    data=[],
+                    columns=[],
+                    style_cell={
+                        'textAlign': 'left',
+                        'padding': '10px',
+                        'fontFamily': 'Arial, sans-serif',
+                        'minWidth': '80px',
+                        'maxWidth': '200px',
+                        'overflow': 'hidden',
+                        'textOverflow': 'ellipsis'
+                    },
+                    style_header={
+                        'backgroundColor': '#3498db',
+                        'color': 'white',
+                        'fontWeight': 'bold',
+                        'textAlign': 'center'
+                    },
+                    style_data_conditional=[
+                        {
+                            'if': {'filter_query': '{Entry Hit} = ✅'},
+                            'backgroundColor': '#d5f4e6',
+                        },
+                        {
+                            'if': {'filter_query': '{Entry Hit} = ❌'},
+                            'backgroundColor': '#fadbd8',
+                        }
+                    ],
+                    page_current=0,
+                    page_size=TABLE_PAGE_SIZE,
+                    page_action='custom',
+                    sort_action='custom',
+                    sort_mode='single',
+                    sort_by=[],
+                    filter_action='custom',
+                    filter_query='',
+                    style_table={
+                        'overflowX': 'auto',
+                        'minWidth': '100%'
+                    },
+                    css=[{
+                        'selector': '.dash-spreadsheet-container',
+                        'rule': 'font-size: 14px;'
+                    }]
+                )
+            ], id='table-container', className='dashboard-table', style={'display': 'none'}),
+        ], id='dashboard-content'),
         
         # Alerts Section
         html.Div(id='alerts-section', className='alerts-section')
@@ -811,10 +1959,11 @@ app.layout = html.Div([
 
 
 def send_telegram_notification(message):
-    """Send Telegram notification with retry logic"""
+    """Send Telegram notification with retry logic, honoring retry_after on 429"""
     max_retries = 3
     
     for attempt in range(max_retries):
+        retry_after = None
         try:
             url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
             
@@ -825,7 +1974,7 @@ def send_telegram_notification(message):
                 'disable_web_page_preview': True
             }
             
-            response = requests.post(url, json=payload, timeout=10)
+            response = telegram_session.post(url, json=payload, timeout=10)
             
             if response.status_code == 200:
                 result = response.json()
@@ -836,40 +1985,43 @@ def send_telegram_notification(message):
                 if DEBUG_MODE:
                     print(f"❌ Telegram notification failed (attempt {attempt + 1}): {response.status_code} - {response.text}")
                 
-                # Don't retry on client errors (4xx)
-                if 400 <= response.status_code < 500:
+                if response.status_code == 429:
+                    # Rate limited: Telegram says exactly how long to back off
+                    try:
+                        retry_after = float(response.json().get('parameters', {}).get('retry_after', 1))
+                    except (ValueError, AttributeError):
+                        retry_after = 1.0
+                # Don't retry on other client errors (4xx)
+                elif 400 <= response.status_code < 500:
                     return False
                     
         except Exception as e:
             if DEBUG_MODE:
                 print(f"❌ Telegram notification error (attempt {attempt + 1}): {str(e)}")
         
-        # Wait before retry (exponential backoff)
+        # Wait before retry (retry_after when rate limited, else exponential backoff)
         if attempt < max_retries - 1:
-            time.sleep(2 ** attempt)
+            time.sleep(min(retry_after, TELEGRAM_MAX_RETRY_AFTER) if retry_after is not None else 2 ** attempt)
     
     return False
 
 
-def send_formatted_telegram_alert(symbol, current_price, alert_level, entry_price=None):
-    """Send beautifully formatted Telegram alert"""
-    try:
-        # Determine alert type and emoji
-        if "Entry" in alert_level:
-            alert_emoji = "🎯"
-            alert_type = "ENTRY ALERT"
-        elif "Stop Loss" in alert_level:
-            alert_emoji = "🛑"
-            alert_type = "STOP LOSS ALERT"
-        elif "Take Profit" in alert_level:
-            alert_emoji = "💰"
-            alert_type = "TAKE PROFIT ALERT"
-        else:
-            alert_emoji = "🚨"
-            alert_type = "PRICE ALERT"
-        
-        # Format the message with Markdown
-        message = f"""
+def get_alert_style(alert_level):
+    """Emoji and title for an alert level"""
+    if "Entry" in alert_level:
+        return "🎯", "ENTRY ALERT"
+    elif "Stop Loss" in alert_level:
+        return "🛑", "STOP LOSS ALERT"
+    elif "Take Profit" in alert_level:
+        return "💰", "TAKE PROFIT ALERT"
+    return "🚨", "PRICE ALERT"
+
+
+def format_telegram_alert(symbol, current_price, alert_level):
+    """Markdown message for a single alert"""
+    alert_emoji, alert_type = get_alert_style(alert_level)
+    
+    return f"""
 🔥 *CRYPTO {alert_type}* {alert_emoji}
 
 
@@ -884,9 +2036,37 @@ def send_formatted_telegram_alert(symbol, current_price, alert_level, entry_pric
 
 💡 _Price is within 1% of your target level!_
 📈 _Check your dashboard for more details._
-        """.strip()
+    """.strip()
+
+
+def format_telegram_alert_batch(items):
+    """Pack several alerts into as few messages as fit Telegram's length limit, as (message, items) pairs"""
+    footer = (f"\n\n⏰ *Time:* `{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}`\n"
+              "💡 _Prices are within 1% of your target levels!_")
+    
+    def header(count):
+        return f"🔥 *CRYPTO ALERTS* ({count}) 🚨\n"
+    
+    batches, lines, batch_items = [], [], []
+    for item in items:
+        alert_emoji, _ = get_alert_style(item["alert_level"])
+        line = f"\n{alert_emoji} `{item['symbol']}` at `${item['current_price']:.5f}` → `{item['alert_level']}`"
         
-        return send_telegram_notification(message)
+        if lines and len(header(len(lines) + 1) + "".join(lines) + line + footer) > TELEGRAM_MAX_MESSAGE_LENGTH:
+            batches.append((header(len(lines)) + "".join(lines) + footer, batch_items))
+            lines, batch_items = [], []
+        lines.append(line)
+        batch_items.append(item)
+    
+    if lines:
+        batches.append((header(len(lines)) + "".join(lines) + footer, batch_items))
+    return batches
+
+
+def send_formatted_telegram_alert(symbol, current_price, alert_level, entry_price=None):
+    """Send beautifully formatted Telegram alert"""
+    try:
+        return send_telegram_notification(format_telegram_alert(symbol, current_price, alert_level))
         
     except Exception as e:
         if DEBUG_MODE:
@@ -896,66 +2076,379 @@ def send_formatted_telegram_alert(symbol, current_price, alert_level, entry_pric
         return send_telegram_notification(simple_message)
 
 
-def check_price_alerts_with_cooldown(symbol, current_price, entries, sl, tp, alerts_sent):
-    """Check if current price is within 1% of any entry, SL, or TP levels with cooldown logic"""
-    alerts = []
-    alert_threshold = 0.01  # 1%
-    new_alerts = []
+# Outbound alert queue: alert evaluation enqueues, a dedicated worker delivers.
+# Pending alerts are keyed so a repeat of an undelivered alert merges into it.
+telegram_queue = {
+    "pending": OrderedDict(),
+    "condition": threading.Condition(),
+    "thread": None,
+    "stats": {
+        "enqueued": 0, "merged": 0, "dropped": 0, "sent": 0, "failed": 0,
+        "total_latency": 0.0, "last_latency": None,
+    },
+}
+
+
+def enqueue_telegram_alert(alert_key, symbol, current_price, alert_level, on_failure=None):
+    """Queue an alert for background delivery without blocking the caller"""
+    start_telegram_sender()
+    dropped = None
+    
+    with telegram_queue["condition"]:
+        pending = telegram_queue["pending"]
+        stats = telegram_queue["stats"]
+        
+        if alert_key in pending:
+            # Still undelivered: refresh it with the latest price instead of queueing a duplicate
+            pending[alert_key]["current_price"] = current_price
+            stats["merged"] += 1
+            return True
+        
+        if len(pending) >= TELEGRAM_QUEUE_SIZE:
+            # Backpressure: drop the oldest pending alert to make room for the newest
+            _, dropped = pending.popitem(last=False)
+            stats["dropped"] += 1
+        
+        pending[alert_key] = {
+            "symbol": symbol,
+            "current_price": current_price,
+            "alert_level": alert_level,
+            "enqueued_at": time.time(),
+            "on_failure": on_failure,
+        }
+        stats["enqueued"] += 1
+        telegram_queue["condition"].notify()
     
-    # Check entries
-    entry_levels = ['1st', '2nd', '3rd']
-    for i, entry in enumerate(entries):
-        if entry and current_price:
-            price_diff_pct = abs(current_price - entry) / entry
-            if price_diff_pct <= alert_threshold:
-                alert_level = f"{entry_levels[i]} Entry (${entry:.5f})"
-                alerts.append(alert_level)
-    
-    # Check Stop Loss
-    if sl and current_price:
-        price_diff_pct = abs(current_price - sl) / sl
-        if price_diff_pct <= alert_threshold:
-            alert_level = f"Stop Loss (${sl:.5f})"
-            alerts.append(alert_level)
-    
-    # Check Take Profit
-    if tp and current_price:
-        price_diff_pct = abs(current_price - tp) / tp
-        if price_diff_pct <= alert_threshold:
-            alert_level = f"Take Profit (${tp:.5f})"
-            alerts.append(alert_level)
-    
-    # Process cooldown logic for each alert
-    for alert_level in alerts:
-        alert_key = f"{symbol}_{alert_level}"
-        
-        # Check if alert was already sent
-        if alert_key in alerts_sent:
-            # Extract the numeric price from alert_level string
-            try:
-                base_price = float(alert_level.split('$')[-1].replace(')', '').replace(',', ''))
-            except ValueError:
-                base_price = None
-            
-            if base_price:
-                pct_away = abs(current_price - base_price) / base_price
-                if pct_away > COOLDOWN_PCT:
-                    # Price has moved far enough away → reset the key
-                    alerts_sent.remove(alert_key)
-                    if DEBUG_MODE:
-                        print(f"🔄 Cooldown reset for {alert_key} (moved {pct_away:.3f} away)")
+    if dropped is not None:
+        if DEBUG_MODE:
+            print(f"🗑️ Telegram queue full, dropped alert for {dropped['symbol']}: {dropped['alert_level']}")
+        if dropped["on_failure"]:
+            dropped["on_failure"]()
+    
+    return True
+
+
+def deliver_telegram_batch(items):
+    """Send one refresh's alerts, coalesced into as few messages as possible"""
+    if len(items) == 1:
+        item = items[0]
+        return [(send_formatted_telegram_alert(item["symbol"], item["current_price"], item["alert_level"]), items)]
+    
+    return [(send_telegram_notification(message), batch_items)
+            for message, batch_items in format_telegram_alert_batch(items)]
+
+
+def telegram_sender_worker():
+    """Deliver queued alerts in coalesced batches, recording latency and failures"""
+    while True:
+        with telegram_queue["condition"]:
+            telegram_queue["condition"].wait_for(lambda: telegram_queue["pending"])
+        
+        # Let the rest of the refresh's alerts arrive, then take them all at once
+        time.sleep(TELEGRAM_COALESCE_SECONDS)
+        with telegram_queue["condition"]:
+            items = list(telegram_queue["pending"].values())
+            telegram_queue["pending"].clear()
         
-        # Send new alert if not in cooldown
-        if alert_key not in alerts_sent:
-            if send_formatted_telegram_alert(symbol, current_price, alert_level):
-                alerts_sent.add(alert_key)
-                new_alerts.append(f"{symbol}: {alert_level}")
+        try:
+            results = deliver_telegram_batch(items)
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"❌ Telegram sender error: {str(e)}")
+            results = [(False, items)]
+        
+        delivered_at = time.time()
+        for delivered, batch_items in results:
+            with telegram_queue["condition"]:
+                stats = telegram_queue["stats"]
+                for item in batch_items:
+                    if delivered:
+                        latency = delivered_at - item["enqueued_at"]
+                        stats["sent"] += 1
+                        stats["total_latency"] += latency
+                        stats["last_latency"] = latency
+                    else:
+                        stats["failed"] += 1
+            
+            if delivered:
                 if DEBUG_MODE:
-                    print(f"📱 New alert sent: {alert_key}")
+                    print(f"📱 Delivered {len(batch_items)} alert(s) in one message")
+            else:
+                for item in batch_items:
+                    if item["on_failure"]:
+                        item["on_failure"]()
+
+
+def start_telegram_sender():
+    """Start the Telegram sender worker once per process"""
+    with telegram_queue["condition"]:
+        if telegram_queue["thread"] is not None and telegram_queue["thread"].is_alive():
+            return telegram_queue["thread"]
+        
+        thread = threading.Thread(target=telegram_sender_worker, name="telegram-sender", daemon=True)
+        telegram_queue["thread"] = thread
+        thread.start()
+        return thread
+
+
+def get_telegram_stats():
+    """Delivery counters for the outbound Telegram queue"""
+    with telegram_queue["condition"]:
+        stats = dict(telegram_queue["stats"])
+        stats["pending"] = len(telegram_queue["pending"])
+    stats["avg_latency"] = stats["total_latency"] / stats["sent"] if stats["sent"] else None
+    return stats
+
+
+# Alert level matrix layout: one row per sheet row, one column per level kind
+ALERT_LEVEL_KINDS = ['entry1', 'entry2', 'entry3', 'sl', 'tp']
+ALERT_LEVEL_LABELS = ['1st Entry', '2nd Entry', '3rd Entry', 'Stop Loss', 'Take Profit']
+
+
+def build_alert_level_matrix(entries, sl, tp):
+    """Lay out rows × {E1, E2, E3, SL, TP} levels, NaN where a level is not set"""
+    entries = np.array(entries, dtype=np.float64).reshape(len(sl), -1)
+    entries[~(entries > 0)] = np.nan
+    
+    # Entries are numbered by position among the row's valid entries
+    compact = np.take_along_axis(entries, np.argsort(np.isnan(entries), axis=1, kind='stable'), axis=1)
+    entry_levels = np.full((len(sl), 3), np.nan)
+    width = min(3, compact.shape[1])
+    entry_levels[:, :width] = compact[:, :width]
+    
+    levels = np.column_stack([entry_levels, np.asarray(sl, dtype=np.float64), np.asarray(tp, dtype=np.float64)])
+    levels[~(levels > 0)] = np.nan
+    return levels
+
+
+def find_alert_candidates(prices, levels):
+    """(row, level column) pairs whose level is within ALERT_THRESHOLD_PCT of the row's price"""
+    prices = np.asarray(prices, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        distance = np.abs(prices[:, np.newaxis] - levels) / levels
+    return np.argwhere(distance <= ALERT_THRESHOLD_PCT)
+
+
+def reset_alert_cooldowns(prices_by_symbol):
+    """Hysteresis: release cooldowns whose price has moved more than COOLDOWN_PCT from the level"""
+    with alert_state["lock"]:
+        keys = [key for key in alert_state["records"] if prices_by_symbol.get(key.symbol)]
+        if not keys:
+            return 0
+        
+        levels = np.fromiter((key.level for key in keys), dtype=np.float64, count=len(keys))
+        prices = np.fromiter((prices_by_symbol[key.symbol] for key in keys), dtype=np.float64, count=len(keys))
+        moved_away = np.abs(prices - levels) / levels > COOLDOWN_PCT
+        
+        for idx in np.flatnonzero(moved_away):
+            clear_alert(keys[idx])
+            if DEBUG_MODE:
+                print(f"🔄 Cooldown reset for {keys[idx].symbol} {keys[idx].kind} at {keys[idx].level}")
+    
+    return int(moved_away.sum())
+
+
+def evaluate_price_alerts(symbols, prices, levels):
+    """Evaluate proximity for every row and level in one pass and queue alerts not in cooldown"""
+    prices = np.asarray(prices, dtype=np.float64)
+    new_alerts = []
+    
+    reset_alert_cooldowns({
+        symbol: float(price) for symbol, price in zip(symbols, prices) if not np.isnan(price) and price
+    })
+    
+    for row, col in find_alert_candidates(prices, levels):
+        symbol, current_price, level = symbols[row], float(prices[row]), float(levels[row, col])
+        key = AlertKey(symbol, ALERT_LEVEL_KINDS[col], level)
+        alert_level = f"{ALERT_LEVEL_LABELS[col]} (${level:.5f})"
+        
+        with alert_state["lock"]:
+            if get_alert_record(key) is not None:
+                continue
+            # Queue new alert; a failed delivery takes it out of cooldown again
+            record_alert_fired(key, alert_level, current_price)
+        
+        enqueue_telegram_alert(
+            key, symbol, current_price, alert_level,
+            on_failure=lambda key=key: clear_alert(key)
+        )
+        new_alerts.append(f"{symbol}: {alert_level}")
+        if DEBUG_MODE:
+            print(f"📱 New alert queued: {symbol} {alert_level}")
     
     return new_alerts
 
 
+# Streaming mode: a WebSocket worker keeps the last traded price per exchange ticker and checks
+# alerts on each tick. The price table is only ever assigned per key and the watchlist is swapped
+# as a whole read-only mapping, so readers need no lock.
+stream_state = {
+    "thread": None,
+    "prices": {},
+    "watch": MappingProxyType({}),
+    "evaluated_at": {},
+    "connected": False,
+    "last_message": None,
+    "stats": {"ticks": 0, "alerts": 0, "reconnects": 0},
+    "lock": threading.Lock(),
+}
+
+
+def update_stream_watchlist(symbols, levels):
+    """Publish which tickers to stream and the alert levels of every sheet row behind them"""
+    rows_by_ticker = {}
+    for row, symbol in enumerate(symbols):
+        rows_by_ticker.setdefault(exchange_pair(symbol), {}).setdefault(symbol, []).append(row)
+    
+    levels = np.asarray(levels, dtype=np.float64)
+    stream_state["watch"] = MappingProxyType({
+        ticker: tuple((symbol, levels[rows]) for symbol, rows in by_symbol.items())
+        for ticker, by_symbol in rows_by_ticker.items()
+    })
+
+
+def get_streamed_prices(symbols):
+    """Prices for the symbols whose last tick is fresher than STREAM_STALE_SECONDS"""
+    now = time.time()
+    prices = {}
+    for symbol in symbols:
+        tick = stream_state["prices"].get(exchange_pair(symbol))
+        if tick is not None and now - tick[1] < STREAM_STALE_SECONDS:
+            prices[symbol] = tick[0]
+    return prices
+
+
+def evaluate_stream_tick(ticker, price):
+    """Check a ticker's rows for alerts, at most once per STREAM_ALERT_INTERVAL_SECONDS"""
+    now = time.time()
+    if now - stream_state["evaluated_at"].get(ticker, 0.0) < STREAM_ALERT_INTERVAL_SECONDS:
+        return []
+    stream_state["evaluated_at"][ticker] = now
+    
+    new_alerts = []
+    for symbol, levels in stream_state["watch"].get(ticker, ()):
+        new_alerts.extend(evaluate_price_alerts([symbol] * len(levels), np.full(len(levels), price), levels))
+    stream_state["stats"]["alerts"] += len(new_alerts)
+    return new_alerts
+
+
+def handle_stream_message(payload):
+    """Record miniTicker payloads (raw, combined-stream wrapped, or array) into the price table"""
+    if isinstance(payload, dict):
+        payload = payload.get('data', payload)
+    tickers = payload if isinstance(payload, list) else [payload]
+    
+    now = time.time()
+    stream_state["last_message"] = now
+    for ticker in tickers:
+        # Subscription acks ({"result": null, "id": 1}) carry no price
+        if not isinstance(ticker, dict) or 's' not in ticker or 'c' not in ticker:
+            continue
+        try:
+            price = float(ticker['c'])
+        except (TypeError, ValueError):
+            continue
+        if price <= 0:
+            continue
+        
+        stream_state["prices"][ticker['s']] = (price, now)
+        stream_state["stats"]["ticks"] += 1
+        try:
+            evaluate_stream_tick(ticker['s'], price)
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"❌ Stream alert check failed for {ticker['s']}: {str(e)}")
+
+
+async def sync_stream_subscriptions(ws, subscribed, request_id):
+    """Send SUBSCRIBE/UNSUBSCRIBE for watchlist changes; returns the new subscribed set"""
+    wanted = {f"{ticker.lower()}@miniTicker" for ticker in stream_state["watch"]}
+    for method, streams in (("UNSUBSCRIBE", subscribed - wanted), ("SUBSCRIBE", wanted - subscribed)):
+        if streams:
+            await ws.send_json({"method": method, "params": sorted(streams), "id": request_id})
+    return wanted
+
+
+async def stream_prices_async():
+    """Keep a WebSocket subscription to the watchlist's tickers, reconnecting with backoff"""
+    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    backoff = 1
+    
+    while True:
+        if not stream_state["watch"]:
+            # Nothing to stream until the first refresh cycle publishes the sheet's symbols
+            await asyncio.sleep(1)
+            continue
+        
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.ws_connect(STREAM_URL, heartbeat=30,
+                                              ssl=ssl_context if STREAM_URL.startswith('wss') else None) as ws:
+                    if DEBUG_MODE:
+                        print(f"📡 Price stream connected: {STREAM_URL}")
+                    stream_state["connected"] = True
+                    backoff = 1
+                    subscribed, request_id = set(), 0
+                    
+                    while True:
+                        if {f"{ticker.lower()}@miniTicker" for ticker in stream_state["watch"]} != subscribed:
+                            request_id += 1
+                            subscribed = await sync_stream_subscriptions(ws, subscribed, request_id)
+                        
+                        try:
+                            message = await ws.receive(timeout=1.0)
+                        except asyncio.TimeoutError:
+                            continue
+                        
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            handle_stream_message(json.loads(message.data))
+                        elif message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING,
+                                              aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"❌ Price stream error: {str(e)}")
+        
+        # Ticks go stale on their own, so the REST path takes over while we reconnect
+        stream_state["connected"] = False
+        stream_state["stats"]["reconnects"] += 1
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, STREAM_RECONNECT_MAX_SECONDS)
+
+
+def stream_worker():
+    """Thread target running the price stream on its own event loop"""
+    asyncio.run(stream_prices_async())
+
+
+def start_price_stream():
+    """Start the price stream worker once per process when STREAMING_MODE is on"""
+    if not STREAMING_MODE:
+        return None
+    
+    with stream_state["lock"]:
+        if stream_state["thread"] is not None and stream_state["thread"].is_alive():
+            return stream_state["thread"]
+        
+        thread = threading.Thread(target=stream_worker, name="price-stream", daemon=True)
+        stream_state["thread"] = thread
+        thread.start()
+        return thread
+
+
+def get_stream_stats():
+    """Connection state and counters for the price stream"""
+    now = time.time()
+    fresh = sum(1 for _, updated in list(stream_state["prices"].values()) if now - updated < STREAM_STALE_SECONDS)
+    return {
+        **stream_state["stats"],
+        'connected': stream_state["connected"],
+        'tickers': len(stream_state["watch"]),
+        'fresh': fresh,
+        'last_message_age': (now - stream_state["last_message"]) if stream_state["last_message"] else None,
+    }
+
+
 def load_sheet_data(url):
     """Load data from Google Sheet CSV URL with caching"""
     df, error = load_csv_with_fallbacks(url)
@@ -965,22 +2458,11 @@ def load_sheet_data(url):
     return df, None
 
 
-@rate_limit(calls_per_second=5)
 def get_multiple_prices(symbols):
     """Fetch multiple prices in one API call with retry logic"""
     return get_multiple_prices_enhanced(symbols)
 
 
-def safe_float(value):
-    """Safely convert value to float"""
-    try:
-        if pd.isna(value) or value == '' or value is None:
-            return None
-        return float(value)
-    except:
-        return None
-
-
 def parse_date_flexible(date_str):
     """Parse date with multiple format support"""
     if pd.isna(date_str) or date_str == '':
@@ -1016,41 +2498,156 @@ def parse_date_flexible(date_str):
     return None
 
 
-def fetch_1d_ohlc_to_today(symbol, start_date):
-    """Fetch daily OHLC data from start_date to today"""
+# Per-pair daily candle store: closed candles never change, so only newer ones are fetched
+# "lock" guards the in-memory pairs; "db_lock" serialises every use of the shared SQLite connection,
+# since candle histories are fetched (and persisted) from several worker threads at once
+candle_cache = {"pairs": {}, "db": None, "lock": threading.Lock(), "db_lock": threading.RLock()}
+
+
+def get_candle_db():
+    """Return the candle persistence database, or None when OHLC_CACHE_DB is not set"""
+    if not OHLC_CACHE_DB:
+        return None
+    with candle_cache["db_lock"]:
+        if candle_cache["db"] is None:
+            try:
+                db = open_sqlite(OHLC_CACHE_DB)
+                db.execute("CREATE TABLE IF NOT EXISTS candles ("
+                           "pair TEXT NOT NULL, open_time INTEGER NOT NULL, kline TEXT NOT NULL, "
+                           "PRIMARY KEY (pair, open_time))")
+                db.execute("CREATE TABLE IF NOT EXISTS candle_ranges (pair TEXT PRIMARY KEY, start_ts INTEGER NOT NULL)")
+                db.commit()
+                candle_cache["db"] = db
+            except sqlite3.Error as e:
+                if DEBUG_MODE:
+                    print(f"❌ Could not open OHLC cache database: {str(e)}")
+                return None
+        return candle_cache["db"]
+
+
+def load_cached_candles(pair):
+    """Return the in-memory candle entry for a pair, loading it from disk on first use"""
+    entry = candle_cache["pairs"].get(pair)
+    if entry is not None:
+        return entry
+    
+    db = get_candle_db()
+    if db is None:
+        return None
+    
     try:
-        clean_symbol = symbol.replace("/", "").replace("-", "").upper() + "USDT"
-        url = "https://fapi.binance.com/fapi/v1/klines"
-        
-        parsed_start_date = parse_date_flexible(start_date)
-        
-        if parsed_start_date is None:
-            return []
-        
-        end_date = datetime.now()
-        
-        start_ts = int(parsed_start_date.timestamp() * 1000)
-        end_ts = int(end_date.timestamp() * 1000)
-        
+        with candle_cache["db_lock"]:
+            row = db.execute("SELECT start_ts FROM candle_ranges WHERE pair = ?", (pair,)).fetchone()
+            if row is None:
+                return None
+            klines = [json.loads(kline) for (kline,) in db.execute(
+                "SELECT kline FROM candles WHERE pair = ? ORDER BY open_time", (pair,))]
+    except (sqlite3.Error, ValueError) as e:
+        if DEBUG_MODE:
+            print(f"❌ Could not load cached candles for {pair}: {str(e)}")
+        return None
+    
+    entry = {"candles": klines, "start_ts": row[0], "fetched_at": 0.0}
+    candle_cache["pairs"][pair] = entry
+    return entry
+
+
+def persist_candles(pair, start_ts, klines):
+    """Upsert closed candles for a pair into the optional SQLite store"""
+    db = get_candle_db()
+    if db is None:
+        return
+    
+    now_ms = int(time.time() * 1000)
+    closed = [k for k in klines if int(k[6]) < now_ms]
+    rows = [(pair, int(k[0]), json.dumps(k, separators=(',', ':'))) for k in closed]
+    try:
+        with candle_cache["db_lock"], db:
+            db.execute("INSERT OR REPLACE INTO candle_ranges (pair, start_ts) VALUES (?, ?)", (pair, start_ts))
+            db.executemany("INSERT OR REPLACE INTO candles (pair, open_time, kline) VALUES (?, ?, ?)", rows)
+    except sqlite3.Error as e:
+        if DEBUG_MODE:
+            print(f"❌ Could not persist candles for {pair}: {str(e)}")
+
+
+def fetch_klines(pair, start_ts, end_ts):
+    """Download daily klines for [start_ts, end_ts], paging through Binance's 1000-candle limit"""
+    url = "https://fapi.binance.com/fapi/v1/klines"
+    klines = []
+    
+    while start_ts <= end_ts:
         params = {
-            "symbol": clean_symbol,
+            "symbol": pair,
             "interval": "1d",
             "startTime": start_ts,
             "endTime": end_ts,
-            "limit": 1000
-        }
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            "limit": OHLC_PAGE_LIMIT
         }
-        response = requests.get(url, params=params, timeout=15, headers=headers)
+        response = plain_session.get(url, params=params, timeout=15)
         response.raise_for_status()
-        candles = response.json()
+        page = response.json()
+        
+        if not isinstance(page, list) or not page:
+            break
         
-        if not isinstance(candles, list):
+        klines.extend(page)
+        if len(page) < OHLC_PAGE_LIMIT:
+            break
+        start_ts = int(page[-1][0]) + 1
+    
+    return klines
+
+
+def fetch_1d_ohlc_to_today(symbol, start_date):
+    """Fetch daily OHLC data from start_date to today, downloading only candles not cached yet"""
+    try:
+        clean_symbol = exchange_pair(symbol)
+        
+        if isinstance(start_date, datetime):
+            parsed_start_date = start_date
+        else:
+            parsed_start_date = parse_date_flexible(start_date)
+        
+        if parsed_start_date is None:
             return []
         
-        return candles
+        start_ts = int(parsed_start_date.timestamp() * 1000)
+        end_ts = int(datetime.now().timestamp() * 1000)
+        
+        with candle_cache["lock"]:
+            entry = load_cached_candles(clean_symbol)
+        
+        if entry is not None and entry["start_ts"] <= start_ts:
+            if time.time() - entry["fetched_at"] >= OHLC_REFRESH_SECONDS:
+                # Everything up to the last closed candle is immutable; refetch from the first open one
+                candles = [k for k in entry["candles"] if int(k[6]) < end_ts]
+                fetch_from = int(candles[-1][0]) + 1 if candles else entry["start_ts"]
+                try:
+                    new_klines = fetch_klines(clean_symbol, fetch_from, end_ts)
+                except Exception as e:
+                    # Serve the cached history until the next successful update
+                    if DEBUG_MODE:
+                        print(f"❌ Incremental OHLC update failed for {symbol}: {str(e)}")
+                    new_klines = None
+                
+                if new_klines is not None:
+                    with candle_cache["lock"]:
+                        entry = {
+                            "candles": candles + [k for k in new_klines if int(k[0]) >= fetch_from],
+                            "start_ts": entry["start_ts"],
+                            "fetched_at": time.time(),
+                        }
+                        candle_cache["pairs"][clean_symbol] = entry
+                    persist_candles(clean_symbol, entry["start_ts"], new_klines)
+        else:
+            # Nothing cached from this far back yet: download the full history once
+            klines = fetch_klines(clean_symbol, start_ts, end_ts)
+            with candle_cache["lock"]:
+                entry = {"candles": klines, "start_ts": start_ts, "fetched_at": time.time()}
+                candle_cache["pairs"][clean_symbol] = entry
+            persist_candles(clean_symbol, start_ts, klines)
+        
+        return [k for k in entry["candles"] if int(k[0]) >= start_ts]
         
     except Exception as e:
         if DEBUG_MODE:
@@ -1091,109 +2688,254 @@ def check_entries_hit_sequentially(candles, entries, symbol=""):
     return entries_hit, hit_dates
 
 
-def calculate_metrics(row, live_price, symbol):
-    """Calculate all trading metrics for a row"""
+def check_entries_hit_vectorized(candles, entries, symbol=""):
+    """Vectorized check_entries_hit_sequentially: first-hit candle per entry computed with NumPy"""
+    if not candles or not entries:
+        return [False] * len(entries), []
+    
     try:
-        entries = []
-        entry_columns = ['Entry 1', 'Entry 2', 'Entry 3']
-        
-        if not any(col in row.index for col in entry_columns):
-            entry_columns = ['1st entry', '2nd entry', '3rd entry']
-        
-        for col in entry_columns:
-            if col in row.index:
-                entry = safe_float(row[col])
-                if entry is not None and entry > 0:
-                    entries.append(entry)
-                else:
-                    entries.append(None)
-            else:
-                entries.append(None)
-        
-        while entries and entries[-1] is None:
-            entries.pop()
-        
-        start_date = None
-        date_columns = ['Date of given', 'Date', 'Start Date', 'Given Date']
-        for col in date_columns:
-            if col in row.index and pd.notna(row[col]):
-                start_date = row[col]
-                break
-        
-        if not entries or live_price is None:
-            return {
-                'entry_hit': False,
-                'entries_hit_status': "–",
-                'avg_entry': None,
-                'pl': None,
-                'entry_down_pct': None,
-                'roi_pct': None
-            }
-        
-        valid_entries = [e for e in entries if e is not None]
-        
-        if not valid_entries:
-            return {
-                'entry_hit': False,
-                'entries_hit_status': "–",
-                'avg_entry': None,
-                'pl': None,
-                'entry_down_pct': None,
-                'roi_pct': None
-            }
-        
-        entries_hit_flags = [False] * len(valid_entries)
-        entries_hit_status = "–"
-        
-        if start_date:
-            candles = fetch_1d_ohlc_to_today(symbol, start_date)
-            if candles:
-                entries_hit_flags, hit_dates = check_entries_hit_sequentially(candles, valid_entries, symbol)
-                
-                hit_count = sum(entries_hit_flags)
-                if hit_count == 0:
-                    entries_hit_status = "No entries hit"
-                else:
-                    hit_entries = []
-                    for i, (hit, date) in enumerate(zip(entries_hit_flags, hit_dates)):
-                        if hit and date:
-                            hit_entries.append(f"Entry {i+1} ({date})")
-                    entries_hit_status = " → ".join(hit_entries)
-            else:
-                entries_hit_status = "No candle data"
-        else:
-            entries_hit_status = "No start date provided"
-        
-        hit_entries = [entry for entry, hit in zip(valid_entries, entries_hit_flags) if hit]
-        
-        if hit_entries:
-            avg_entry = sum(hit_entries) / len(hit_entries)
-        else:
-            avg_entry = sum(valid_entries) / len(valid_entries)
-        
-        quantity = safe_float(row.get('Quantity', 1)) or 1
-        pl = (live_price - avg_entry) * quantity if avg_entry else None
-        entry_down_pct = ((live_price - avg_entry) / avg_entry) * 100 if avg_entry else None
-        roi_pct = (pl / (avg_entry * quantity)) * 100 if avg_entry and pl is not None else None
-        
-        return {
-            'entry_hit': any(entries_hit_flags),
-            'entries_hit_status': entries_hit_status,
-            'avg_entry': avg_entry,
-            'pl': pl,
-            'entry_down_pct': entry_down_pct,
-            'roi_pct': roi_pct
-        }
+        open_times = np.array([candle[0] for candle in candles], dtype=np.int64)
+        lows = np.array([candle[3] for candle in candles], dtype=np.float64)
+        levels = np.array(entries, dtype=np.float64)
+    except (ValueError, TypeError, IndexError):
+        # Malformed candles are skipped one by one in the loop implementation
+        return check_entries_hit_sequentially(candles, entries, symbol)
+    
+    if np.any(open_times[1:] < open_times[:-1]):
+        order = np.argsort(open_times, kind='stable')
+        open_times, lows = open_times[order], lows[order]
+    no_hit = len(lows)
+    
+    # entries × candles: did this candle trade down to this entry?
+    touched = lows[np.newaxis, :] <= levels[:, np.newaxis]
+    first_hit = np.where(touched.any(axis=1), touched.argmax(axis=1), no_hit)
+    
+    # A lower entry being hit implies every higher entry was hit on that candle too
+    first_hit = np.minimum.accumulate(first_hit[::-1])[::-1]
+    
+    entries_hit = [bool(idx < no_hit) for idx in first_hit]
+    hit_dates = [
+        datetime.fromtimestamp(open_times[idx] / 1000).strftime('%Y-%m-%d') if idx < no_hit else None
+        for idx in first_hit
+    ]
     
-    except Exception as e:
-        return {
-            'entry_hit': False,
-            'entries_hit_status': f"Error: {str(e)[:50]}",
-            'avg_entry': None,
-            'pl': None,
-            'entry_down_pct': None,
-            'roi_pct': None
-        }
+    return entries_hit, hit_dates
+
+
+def benchmark_entries_hit_detection(rows=200, days=1500, repeats=3, seed=42):
+    """Compare the loop and vectorized entry-hit checks on synthetic histories"""
+    rng = np.random.default_rng(seed)
+    start_ts = int(datetime(2020, 1, 1).timestamp() * 1000)
+    day_ms = 24 * 60 * 60 * 1000
+    
+    workloads = []
+    for _ in range(rows):
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.03, days)))
+        lows = closes * (1 - rng.uniform(0, 0.05, days))
+        candles = [
+            [start_ts + i * day_ms, f"{closes[i]:.5f}", f"{closes[i] * 1.02:.5f}", f"{lows[i]:.5f}",
+             f"{closes[i]:.5f}", "0", start_ts + (i + 1) * day_ms - 1]
+            for i in range(days)
+        ]
+        entries = sorted(rng.uniform(30, 100, 3), reverse=True)
+        workloads.append((candles, entries))
+    
+    timings = {}
+    for name, func in (('loop', check_entries_hit_sequentially), ('vectorized', check_entries_hit_vectorized)):
+        best = float('inf')
+        for _ in range(repeats):
+            started = time.perf_counter()
+            results = [func(candles, entries) for candles, entries in workloads]
+            best = min(best, time.perf_counter() - started)
+        timings[name] = (best, results)
+    
+    if timings['loop'][1] != timings['vectorized'][1]:
+        raise AssertionError("Vectorized entry-hit results differ from the loop implementation")
+    
+    loop_time, vectorized_time = timings['loop'][0], timings['vectorized'][0]
+    print(f"📏 Entry-hit benchmark: {rows} rows × {days} daily candles")
+    print(f"   Loop:       {loop_time * 1000:.1f} ms")
+    print(f"   Vectorized: {vectorized_time * 1000:.1f} ms")
+    print(f"   Speedup:    {loop_time / vectorized_time:.1f}x (results identical)")
+    
+    return {'loop_seconds': loop_time, 'vectorized_seconds': vectorized_time}
+
+
+# Column aliases accepted in the sheet, in order of preference
+SYMBOL_COLUMNS = ['Symbol', 'PAIR NAME', 'Pair', 'symbol', 'pair']
+ENTRY_COLUMN_SETS = [['Entry 1', 'Entry 2', 'Entry 3'], ['1st entry', '2nd entry', '3rd entry']]
+DATE_COLUMNS = ['Date of given', 'Date', 'Start Date', 'Given Date']
+STOP_LOSS_COLUMNS = ['SL', 'Stop Loss']
+TAKE_PROFIT_COLUMNS = ['TP', 'Take Profit']
+METRIC_COLUMNS = ['Symbol', 'Live Price', 'Entry Status', 'Entry Hit', 'Avg Entry', 'P/L', 'Entry % Down', 'ROI %']
+
+
+def resolve_sheet_schema(columns):
+    """Resolve the sheet's column aliases once per frame instead of once per row"""
+    columns = list(columns)
+    
+    def first_present(candidates):
+        return next((col for col in candidates if col in columns), None)
+    
+    entry_columns = ENTRY_COLUMN_SETS[0]
+    if not any(col in columns for col in entry_columns):
+        entry_columns = ENTRY_COLUMN_SETS[1]
+    
+    return {
+        'symbol': first_present(SYMBOL_COLUMNS),
+        # Metrics use one naming set (missing columns become empty slots)
+        'entries': [col if col in columns else None for col in entry_columns],
+        # Alerts consider every entry column present, across both naming sets
+        'alert_entries': [col for col_set in ENTRY_COLUMN_SETS for col in col_set if col in columns],
+        'stop_loss': first_present(STOP_LOSS_COLUMNS),
+        'take_profit': first_present(TAKE_PROFIT_COLUMNS),
+        'dates': [col for col in DATE_COLUMNS if col in columns],
+        'quantity': 'Quantity' if 'Quantity' in columns else None,
+    }
+
+
+def parse_numeric_column(df, col):
+    """Convert a whole column to float64, NaN where missing or unparseable"""
+    if col is None:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def parse_sheet_columns(df, schema):
+    """Parse every column the pipeline needs in one columnar pass"""
+    symbols = df[schema['symbol']]
+    symbol_text = symbols.astype(str).str.strip()
+    valid_mask = (symbols.notna() & (symbol_text != '')).to_numpy()
+    
+    entries = np.column_stack([parse_numeric_column(df, col) for col in schema['entries']])
+    entries[~(entries > 0)] = np.nan
+    
+    if schema['alert_entries']:
+        alert_entries = np.column_stack([parse_numeric_column(df, col) for col in schema['alert_entries']])
+        alert_entries[~(alert_entries > 0)] = np.nan
+    else:
+        alert_entries = np.empty((len(df), 0))
+    
+    quantity = parse_numeric_column(df, schema['quantity'])
+    quantity[np.isnan(quantity) | (quantity == 0)] = 1
+    
+    if schema['dates']:
+        # First non-empty date column per row
+        start_dates = df[schema['dates']].astype(object).bfill(axis=1).iloc[:, 0].to_numpy()
+    else:
+        start_dates = np.full(len(df), None, dtype=object)
+    
+    return {
+        'symbols': symbol_text.to_numpy(),
+        'valid': valid_mask,
+        'entries': entries,
+        'alert_entries': alert_entries,
+        'stop_loss': parse_numeric_column(df, schema['stop_loss']),
+        'take_profit': parse_numeric_column(df, schema['take_profit']),
+        'quantity': quantity,
+        'start_dates': start_dates,
+    }
+
+
+# Schema and parsed columns of the last sheet frame, reused while the CSV is unchanged
+sheet_cache = {"df": None, "schema": None, "parsed": None}
+
+
+def get_parsed_sheet(df):
+    """Resolve and parse the sheet, skipping the work when the loader returned the same frame"""
+    if sheet_cache["df"] is df:
+        return sheet_cache["schema"], sheet_cache["parsed"]
+    
+    schema = resolve_sheet_schema(df.columns)
+    parsed = parse_sheet_columns(df, schema) if schema['symbol'] is not None else None
+    sheet_cache.update({"df": df, "schema": schema, "parsed": parsed})
+    return schema, parsed
+
+
+def plan_candle_fetches(symbols, start_dates, needed):
+    """Parse each needed row's start date and keep the earliest one per distinct exchange pair"""
+    row_starts = [None] * len(symbols)
+    earliest = {}
+    
+    for i in np.flatnonzero(needed):
+        start_date = start_dates[i]
+        if start_date is None or pd.isna(start_date):
+            continue
+        row_start = parse_date_flexible(start_date)
+        if row_start is None:
+            continue
+        row_starts[i] = row_start
+        pair = exchange_pair(symbols[i])
+        if pair not in earliest or row_start < earliest[pair]:
+            earliest[pair] = row_start
+    
+    return row_starts, earliest
+
+
+def fetch_candle_histories(earliest):
+    """Fetch each distinct pair's candles once, from the earliest start any of its rows needs"""
+    if not earliest:
+        return {}
+    
+    workers = max(1, min(OHLC_FETCH_WORKERS, len(earliest)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pair: pool.submit(fetch_1d_ohlc_to_today, pair, start) for pair, start in earliest.items()}
+        return {pair: future.result() for pair, future in futures.items()}
+
+
+def compute_entry_hits(symbol, candles, valid_entries):
+    """Check which of a row's entries have been hit in its candle history"""
+    entries_hit_flags = [False] * len(valid_entries)
+    
+    if not candles:
+        return entries_hit_flags, "No candle data"
+    
+    entries_hit_flags, hit_dates = check_entries_hit_vectorized(candles, valid_entries, symbol)
+    
+    if sum(entries_hit_flags) == 0:
+        return entries_hit_flags, "No entries hit"
+    
+    hit_entries = []
+    for i, (hit, date) in enumerate(zip(entries_hit_flags, hit_dates)):
+        if hit and date:
+            hit_entries.append(f"Entry {i+1} ({date})")
+    return entries_hit_flags, " → ".join(hit_entries)
+
+
+def calculate_metrics_vectorized(entries, entries_hit, live_prices, quantity):
+    """Avg entry, P/L, entry % down and ROI for all rows at once (NaN where not computable)"""
+    valid = ~np.isnan(entries)
+    hit = entries_hit & valid
+    
+    filled = np.where(valid, entries, 0.0)
+    hit_count = hit.sum(axis=1)
+    valid_count = valid.sum(axis=1)
+    
+    # Average the hit entries, or every valid entry when none was hit yet
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_entry = np.where(
+            hit_count > 0,
+            (filled * hit).sum(axis=1) / hit_count,
+            filled.sum(axis=1) / valid_count
+        )
+        avg_entry[(valid_count == 0) | np.isnan(live_prices)] = np.nan
+        
+        pl = (live_prices - avg_entry) * quantity
+        entry_down_pct = (live_prices - avg_entry) / avg_entry * 100
+        roi_pct = pl / (avg_entry * quantity) * 100
+    
+    return {
+        'entry_hit': hit.any(axis=1) & ~np.isnan(avg_entry),
+        'avg_entry': avg_entry,
+        'pl': pl,
+        'entry_down_pct': entry_down_pct,
+        'roi_pct': roi_pct,
+    }
+
+
+def format_metric_column(values, template):
+    """Format a metric column, showing – for missing or zero values"""
+    return [template.format(v) if v and not np.isnan(v) else "–" for v in values]
 
 
 def process_data():
@@ -1203,133 +2945,297 @@ def process_data():
     if error or df is None or df.empty:
         return None, error
     
-    # Memory cleanup every 50 updates
-    if not hasattr(current_data, 'update_count'):
-        current_data['update_count'] = 0
-    current_data['update_count'] += 1
+    # Alert-state eviction only touches expired records, so it is cheap every update
+    current_data['update_count'] = current_data.get('update_count', 0) + 1
+    cleanup_old_alerts()
     
-    if current_data['update_count'] % 50 == 0:
-        cleanup_old_alerts()
-    
-    # Identify symbol column
-    symbol_col = None
-    for col in ['Symbol', 'PAIR NAME', 'Pair', 'symbol', 'pair']:
-        if col in df.columns:
-            symbol_col = col
-            break
+    schema, parsed = get_parsed_sheet(df)
+    symbol_col = schema['symbol']
     
     if symbol_col is None:
         return None, "Could not find Symbol/Pair column"
     
-    symbols = df[symbol_col].tolist()
-    
     # Validate symbols list
-    if not symbols or all(pd.isna(symbol) for symbol in symbols):
+    if df[symbol_col].isna().all():
         return None, "No valid symbols found in data"
     
-    # Filter out empty/invalid symbols
-    valid_symbols = [str(symbol).strip() for symbol in symbols if pd.notna(symbol) and str(symbol).strip()]
+    rows = np.flatnonzero(parsed['valid'])
     
-    if not valid_symbols:
+    if len(rows) == 0:
         return None, "No valid symbols after filtering"
     
-    price_data = get_multiple_prices(valid_symbols)
+    symbols = parsed['symbols'][rows]
+    # Network work is planned per distinct symbol; rows only slice the shared results
+    price_data = get_multiple_prices(pd.unique(symbols).tolist())
+    live_prices = np.array([price_data.get(symbol) or np.nan for symbol in symbols], dtype=np.float64)
+    
+    entries = parsed['entries'][rows]
+    alert_entries = parsed['alert_entries'][rows]
+    stop_loss = parsed['stop_loss'][rows]
+    take_profit = parsed['take_profit'][rows]
+    start_dates = parsed['start_dates'][rows]
+    
+    # Check alerts with cooldown logic for all rows and levels at once
+    try:
+        levels = build_alert_level_matrix(alert_entries, stop_loss, take_profit)
+        if STREAMING_MODE:
+            update_stream_watchlist(symbols.tolist(), levels)
+        all_new_alerts = evaluate_price_alerts(symbols, live_prices, levels)
+    except Exception as e:
+        if DEBUG_MODE:
+            print(f"❌ Error checking alerts: {str(e)}")
+        all_new_alerts = []
+    
+    # One candle history per distinct symbol, sliced to each row's start date
+    entries_hit = np.zeros(entries.shape, dtype=bool)
+    entry_status = np.full(len(rows), "–", dtype=object)
+    failed = np.zeros(len(rows), dtype=bool)
     
-    results = []
-    all_new_alerts = []
+    needed = (~np.isnan(entries)).any(axis=1) & ~np.isnan(live_prices)
+    row_starts, earliest = plan_candle_fetches(symbols, start_dates, needed)
+    histories = fetch_candle_histories(earliest)
     
-    for _, row in df.iterrows():
-        symbol = row[symbol_col]
+    for i, symbol in enumerate(symbols):
+        if not needed[i]:
+            continue
+        positions = np.flatnonzero(~np.isnan(entries[i]))
         
-        # Skip invalid symbols
-        if pd.isna(symbol) or str(symbol).strip() == '':
+        if start_dates[i] is None or pd.isna(start_dates[i]):
+            entry_status[i] = "No start date provided"
             continue
-            
-        symbol = str(symbol).strip()
-        live_price = price_data.get(symbol)
-        
-        if live_price:
-            # Check for price alerts with cooldown
-            entries = []
-            for col in ['Entry 1', 'Entry 2', 'Entry 3', '1st entry', '2nd entry', '3rd entry']:
-                if col in row.index:
-                    entry = safe_float(row[col])
-                    if entry and entry > 0:
-                        entries.append(entry)
-            
-            sl = safe_float(row.get('SL', row.get('Stop Loss')))
-            tp = safe_float(row.get('TP', row.get('Take Profit')))
-            
-            # Check alerts with cooldown logic
-            try:
-                new_alerts = check_price_alerts_with_cooldown(
-                    symbol, live_price, entries, sl, tp, current_data["alerts_sent"]
-                )
-                all_new_alerts.extend(new_alerts)
-            except Exception as e:
-                if DEBUG_MODE:
-                    print(f"❌ Error checking alerts for {symbol}: {str(e)}")
         
-        # Calculate metrics with error handling
         try:
-            metrics = calculate_metrics(row, live_price, symbol)
+            if row_starts[i] is None:
+                candles = []
+            else:
+                start_ts = int(row_starts[i].timestamp() * 1000)
+                candles = [k for k in histories.get(exchange_pair(symbol), []) if int(k[0]) >= start_ts]
+            flags, entry_status[i] = compute_entry_hits(symbol, candles, entries[i, positions].tolist())
+            entries_hit[i, positions] = flags
         except Exception as e:
             if DEBUG_MODE:
                 print(f"❌ Error calculating metrics for {symbol}: {str(e)}")
-            metrics = {
-                'entry_hit': False,
-                'entries_hit_status': "Error",
-                'avg_entry': None,
-                'pl': None,
-                'entry_down_pct': None,
-                'roi_pct': None
-            }
-        
-        result_row = {
-            'Symbol': symbol,
-            'Live Price': f"${live_price:.5f}" if live_price else "–",
-            'Entry Status': metrics['entries_hit_status'],
-            'Entry Hit': '✅' if metrics['entry_hit'] else '❌',
-            'Avg Entry': f"${metrics['avg_entry']:.5f}" if metrics['avg_entry'] else "–",
-            'P/L': f"${metrics['pl']:.5f}" if metrics['pl'] else "–",
-            'Entry % Down': f"{metrics['entry_down_pct']:.2f}%" if metrics['entry_down_pct'] else "–",
-            'ROI %': f"{metrics['roi_pct']:.2f}%" if metrics['roi_pct'] else "–",
-        }
-        
-        # Add other columns from original data
-        for col in df.columns:
-            if col not in result_row and col != symbol_col:
-                result_row[col] = row[col]
-        
-        results.append(result_row)
+            entry_status[i] = f"Error: {str(e)[:50]}"
+            failed[i] = True
+    
+    metrics = calculate_metrics_vectorized(entries, entries_hit, live_prices, parsed['quantity'][rows])
+    for key in ('avg_entry', 'pl', 'entry_down_pct', 'roi_pct'):
+        metrics[key][failed] = np.nan
+    metrics['entry_hit'][failed] = False
+    
+    results_df = pd.DataFrame({
+        'Symbol': symbols,
+        'Live Price': format_metric_column(live_prices, "${:.5f}"),
+        'Entry Status': entry_status,
+        'Entry Hit': np.where(metrics['entry_hit'], '✅', '❌'),
+        'Avg Entry': format_metric_column(metrics['avg_entry'], "${:.5f}"),
+        'P/L': format_metric_column(metrics['pl'], "${:.5f}"),
+        'Entry % Down': format_metric_column(metrics['entry_down_pct'], "{:.2f}%"),
+        'ROI %': format_metric_column(metrics['roi_pct'], "{:.2f}%"),
+    })
     
-    if not results:
-        return None, "No valid data processed"
+    # Add other columns from original data
+    extra_columns = [col for col in df.columns if col not in METRIC_COLUMNS and col != symbol_col]
+    if extra_columns:
+        results_df = pd.concat(
+            [results_df, df[extra_columns].iloc[rows].reset_index(drop=True)], axis=1
+        )
     
-    results_df = pd.DataFrame(results)
     current_data["df"] = results_df
     current_data["last_update"] = datetime.now()
     
     return results_df, all_new_alerts
 
 
+# Background refresh engine: a single worker runs process_data() once per period
+# and publishes an immutable snapshot that every dashboard callback renders from.
+refresh_state = {
+    "snapshot": None,
+    "history": OrderedDict(),
+    "thread": None,
+    "version": 0,
+    "running": False,
+    "condition": threading.Condition(),
+    "wake": threading.Event(),
+}
+
+
+def publish_snapshot(results_df, alerts, error=None):
+    """Publish a new read-only snapshot of the latest refresh cycle"""
+    with refresh_state["condition"]:
+        refresh_state["version"] += 1
+        snapshot = MappingProxyType({
+            "version": refresh_state["version"],
+            "df": results_df,
+            "alerts": tuple(alerts or ()),
+            "error": error,
+            "created_at": datetime.now(),
+        })
+        refresh_state["snapshot"] = snapshot
+        history = refresh_state["history"]
+        history[snapshot["version"]] = snapshot
+        while len(history) > SNAPSHOT_HISTORY_SIZE:
+            history.popitem(last=False)
+        refresh_state["condition"].notify_all()
+    return snapshot
+
+
+def get_latest_snapshot():
+    """Return the most recently published snapshot (or None before the first cycle)"""
+    return refresh_state["snapshot"]
+
+
+def get_snapshot(version):
+    """Return a recent snapshot by version, or None once it has left the history"""
+    if version is None:
+        return None
+    with refresh_state["condition"]:
+        history = refresh_state["history"]
+        snapshot = history.get(version)
+        if snapshot is not None:
+            # Evict least recently read: a client frozen on an old version keeps it alive by asking for it
+            history.move_to_end(version)
+        return snapshot
+
+
+def run_refresh_cycle():
+    """Run the CSV→prices→metrics→alerts pipeline once and publish the result"""
+    try:
+        results_df, alerts = process_data()
+    except Exception as processing_error:
+        if DEBUG_MODE:
+            print(f"❌ Processing error: {processing_error}")
+        previous = get_latest_snapshot()
+        return publish_snapshot(
+            previous["df"] if previous else None, [],
+            f"Data processing error: {str(processing_error)[:100]}"
+        )
+
+    if results_df is None:
+        # process_data returns the error message in place of the alerts list
+        previous = get_latest_snapshot()
+        return publish_snapshot(
+            previous["df"] if previous else None, [],
+            str(alerts) if alerts else "Unknown error occurred"
+        )
+
+    return publish_snapshot(results_df, alerts)
+
+
+def refresh_worker():
+    """Refresh loop: one pipeline run per period, or sooner when woken up"""
+    while True:
+        refresh_state["wake"].clear()
+        started = time.time()
+        refresh_state["running"] = True
+        try:
+            run_refresh_cycle()
+        finally:
+            refresh_state["running"] = False
+
+        if DEBUG_MODE:
+            print(f"🔄 Refresh cycle {refresh_state['version']} finished in {time.time() - started:.2f}s")
+
+        refresh_state["wake"].wait(timeout=max(0.0, REFRESH_INTERVAL_SECONDS - (time.time() - started)))
+
+
+def start_background_refresh():
+    """Start the background refresh worker once per process"""
+    with refresh_state["condition"]:
+        if refresh_state["thread"] is not None and refresh_state["thread"].is_alive():
+            return refresh_state["thread"]
+
+        thread = threading.Thread(target=refresh_worker, name="refresh-worker", daemon=True)
+        refresh_state["thread"] = thread
+        thread.start()
+
+    if DEBUG_MODE:
+        print(f"🚀 Background refresh started (every {REFRESH_INTERVAL_SECONDS}s)")
+    return thread
+
+
+def request_refresh(wait_seconds=0):
+    """Wake the refresh worker and optionally wait for the snapshot it produces"""
+    with refresh_state["condition"]:
+        # A cycle already in flight started before this request, so wait for the one after it
+        target_version = refresh_state["version"] + (2 if refresh_state["running"] else 1)
+    refresh_state["wake"].set()
+
+    if wait_seconds > 0:
+        with refresh_state["condition"]:
+            refresh_state["condition"].wait_for(
+                lambda: refresh_state["version"] >= target_version, timeout=wait_seconds
+            )
+    return get_latest_snapshot()
+
+
 def check_connection_health():
     """Check if all external services are accessible"""
     return check_connection_health_enhanced()
 
 
+# Health monitor: probes run in the background and the dashboard only reads the cached results
+health_state = {"results": None, "thread": None, "lock": threading.Lock()}
+
+
+def health_monitor_worker():
+    """Probe all services on their own cadence, independent of dashboard renders"""
+    while True:
+        try:
+            health_state["results"] = run_health_probes()
+        except Exception as e:
+            if DEBUG_MODE:
+                print(f"❌ Health monitor error: {str(e)}")
+        time.sleep(HEALTH_CHECK_INTERVAL_SECONDS)
+
+
+def start_health_monitor():
+    """Start the background health monitor once per process"""
+    with health_state["lock"]:
+        if health_state["thread"] is not None and health_state["thread"].is_alive():
+            return health_state["thread"]
+        
+        thread = threading.Thread(target=health_monitor_worker, name="health-monitor", daemon=True)
+        health_state["thread"] = thread
+        thread.start()
+        return thread
+
+
+def get_cached_health():
+    """Latest health results ({service: {ok, latency, checked_at, error}}) or None before the first probe"""
+    return health_state["results"]
+
+
+def start_background_workers():
+    """Start every background worker the dashboard reads from"""
+    load_alert_state()
+    start_background_refresh()
+    start_health_monitor()
+    start_telegram_sender()
+    start_price_stream()
+
+
+TABLE_VISIBLE = {}
+TABLE_HIDDEN = {'display': 'none'}
+
+
 @app.callback(
-    [Output('dashboard-content', 'children'),
+    [Output('dashboard-message', 'children'),
+     Output('summary-cards', 'children'),
+     Output('table-container', 'style'),
+     Output('data-store', 'data'),
      Output('status-section', 'children'),
      Output('alerts-section', 'children')],
     [Input('interval-component', 'n_intervals'),
      Input('manual-refresh-btn', 'n_clicks'),
-     Input('auto-refresh-toggle', 'value')]
+     Input('auto-refresh-toggle', 'value')],
+    [State('data-store', 'data')]
 )
-def update_dashboard(n_intervals, manual_click, auto_refresh_enabled):
-    """Update dashboard callback with comprehensive error handling"""
+def update_dashboard(n_intervals, manual_click, auto_refresh_enabled, rendered_version):
+    """Render the latest background snapshot as a diff against the version the client already shows"""
     try:
-        # Only update if auto-refresh is enabled or manual refresh clicked
+        start_background_workers()
+        
         ctx = dash.callback_context
         if not ctx.triggered:
             trigger_id = 'interval-component'
@@ -1337,33 +3243,43 @@ def update_dashboard(n_intervals, manual_click, auto_refresh_enabled):
             trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
         
         if trigger_id == 'interval-component' and 'enabled' not in (auto_refresh_enabled or []):
-            # Skip auto-refresh if disabled
-            if current_data["df"] is not None:
-                return create_dashboard_layout(current_data["df"]), create_status_section(), create_alerts_section([])
-            else:
-                return html.Div("Enable auto-refresh or click manual refresh to load data"), html.Div(), html.Div()
+            # Auto-refresh disabled: keep the data the client already shows frozen; only the status updates
+            if get_snapshot(rendered_version) is not None:
+                return (dash.no_update, dash.no_update, dash.no_update, dash.no_update,
+                        create_status_section(), create_alerts_section([]))
+            return (html.Div("Enable auto-refresh or click manual refresh to load data"), [], TABLE_HIDDEN,
+                    None, html.Div(), html.Div())
+        
+        if trigger_id == 'manual-refresh-btn':
+            snapshot = request_refresh(wait_seconds=MANUAL_REFRESH_WAIT_SECONDS)
+        else:
+            snapshot = get_latest_snapshot()
         
-        # Process data with comprehensive error handling
-        try:
-            results_df, alerts = process_data()
-        except Exception as processing_error:
-            error_message = f"Data processing error: {str(processing_error)[:100]}"
-            if DEBUG_MODE:
-                print(f"❌ Processing error: {processing_error}")
+        if snapshot is None:
             return html.Div([
-                html.H3("Processing Error", style={'color': 'orange'}),
-                html.P(error_message),
-                html.P("Retrying on next refresh...")
-            ]), create_status_section(), html.Div()
+                html.H3("Loading Data...", style={'color': '#3498db'}),
+                html.P("The first refresh is running in the background")
+            ]), [], TABLE_HIDDEN, None, create_status_section(), html.Div()
+        
+        rendered = get_snapshot(rendered_version)
+        version = snapshot["version"] if snapshot["version"] != rendered_version else dash.no_update
         
-        if results_df is None:
+        if snapshot["df"] is None:
             return html.Div([
                 html.H3("Error Loading Data", style={'color': 'red'}),
-                html.P(str(alerts) if alerts else "Unknown error occurred"),
+                html.P(snapshot["error"] or "Unknown error occurred"),
                 html.P("Check your internet connection and CSV URL")
-            ]), create_status_section(), html.Div()
+            ]), [], TABLE_HIDDEN, None, create_status_section(), html.Div()
         
-        return create_dashboard_layout(results_df), create_status_section(), create_alerts_section(alerts or [])
+        if snapshot["error"]:
+            # Keep serving the last good data while reporting the failed cycle
+            return (html.P(f"⚠️ {snapshot['error']} - showing last successful data, retrying on next refresh...",
+                           style={'color': 'orange'}),
+                    patch_summary_cards(rendered, snapshot), TABLE_VISIBLE, version,
+                    create_status_section(), html.Div())
+        
+        return (html.Div(), patch_summary_cards(rendered, snapshot), TABLE_VISIBLE, version,
+                create_status_section(), create_alerts_section(list(snapshot["alerts"])))
         
     except Exception as e:
         # Fallback error handling
@@ -1375,79 +3291,243 @@ def update_dashboard(n_intervals, manual_click, auto_refresh_enabled):
             html.H3("Dashboard Error", style={'color': 'red'}),
             html.P(error_msg),
             html.P("Please refresh the page or check the console for details")
-        ]), html.Div(), html.Div()
+        ]), [], TABLE_HIDDEN, None, html.Div(), html.Div()
 
 
-def create_dashboard_layout(df):
-    """Create the main dashboard layout with responsive design"""
+@app.callback(
+    [Output('results-table', 'data'),
+     Output('results-table', 'columns'),
+     Output('results-table', 'page_count'),
+     Output('table-store', 'data')],
+    [Input('data-store', 'data'),
+     Input('results-table', 'page_current'),
+     Input('results-table', 'page_size'),
+     Input('results-table', 'sort_by'),
+     Input('results-table', 'filter_query')],
+    [State('table-store', 'data')]
+)
+def update_results_table(version, page_current, page_size, sort_by, filter_query, rendered):
+    """Serve only the visible page, patching just the changed cells when only the snapshot moved"""
+    snapshot = get_snapshot(version) or get_latest_snapshot()
+    if version is None or snapshot is None or snapshot["df"] is None:
+        return [], [], 1, None
+    
+    df = snapshot["df"]
+    query = {'page_current': page_current or 0, 'page_size': page_size or TABLE_PAGE_SIZE,
+             'sort_by': sort_by or [], 'filter_query': filter_query or ''}
+    page, page_count = query_table_page(df, query)
+    columns = [{'name': col, 'id': col, 'presentation': 'markdown'} for col in df.columns]
+    state = {'version': snapshot["version"], 'query': query, 'page_count': page_count}
+    
+    # Same page of a newer snapshot: diff it against what the client already has
+    previous = get_snapshot(rendered['version']) if rendered and rendered['query'] == query else None
+    if previous is not None and previous["df"] is not None and list(previous["df"].columns) == list(df.columns):
+        previous_page, _ = query_table_page(previous["df"], query)
+        if previous_page.index.equals(page.index):
+            return (diff_table_page(previous_page, page), dash.no_update,
+                    page_count if page_count != rendered['page_count'] else dash.no_update, state)
+    
+    return page.to_dict('records'), columns, page_count, state
+
+
+def query_table_page(df, query):
+    """One page of the filtered and sorted frame, plus the page count"""
+    view = query_table(df, query['sort_by'], query['filter_query'])
+    first = query['page_current'] * query['page_size']
+    return view.iloc[first:first + query['page_size']], max(1, -(-len(view) // query['page_size']))
+
+
+def diff_table_page(previous_page, page):
+    """Patch only the cells that changed between two renders of the same rows (no_update if none did)"""
+    changed = (previous_page.ne(page) & ~(previous_page.isna() & page.isna())).to_numpy()
+    if not changed.any():
+        return dash.no_update
+    
+    patched = Patch()
+    for row, col in np.argwhere(changed):
+        patched[int(row)][page.columns[col]] = page.iat[row, col]
+    return patched
+
+
+def summary_card_values(df):
+    """Displayed values of the summary cards: total pairs, entries hit and hit rate"""
     total_rows = len(df)
-    entries_hit = sum(1 for _, row in df.iterrows() if row['Entry Hit'] == '✅')
+    entries_hit = int((df['Entry Hit'] == '✅').sum())
     hit_rate = (entries_hit / total_rows * 100) if total_rows > 0 else 0
+    return [str(total_rows), f"{entries_hit}/{total_rows}", f"{hit_rate:.1f}%"]
+
+
+def patch_summary_cards(rendered, snapshot):
+    """Full cards when the client has none, otherwise a Patch of the card values that changed"""
+    if rendered is None or rendered["df"] is None:
+        return create_summary_cards(snapshot["df"])
+    if rendered["df"] is snapshot["df"]:
+        return dash.no_update
+    
+    changed = [
+        (position, value)
+        for position, (before, value) in enumerate(zip(summary_card_values(rendered["df"]),
+                                                        summary_card_values(snapshot["df"])))
+        if before != value
+    ]
+    if not changed:
+        return dash.no_update
+    
+    cards = Patch()
+    for position, value in changed:
+        cards[position]['props']['children'][0]['props']['children'] = value
+    return cards
+
+
+def create_summary_cards(df):
+    """Summary cards for the snapshot: total pairs, entries hit and hit rate"""
+    total_pairs, entries_hit, hit_rate = summary_card_values(df)
     
-    return html.Div([
-        # Summary Cards
+    return [
         html.Div([
-            html.Div([
-                html.H3(str(total_rows), style={'margin': '0', 'color': '#2c3e50'}),
-                html.P("Total Pairs", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='summary-card'),
-            
-            html.Div([
-                html.H3(f"{entries_hit}/{total_rows}", style={'margin': '0', 'color': '#27ae60'}),
-                html.P("Entries Hit", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='summary-card'),
-            
-            html.Div([
-                html.H3(f"{hit_rate:.1f}%", style={'margin': '0', 'color': '#3498db'}),
-                html.P("Hit Rate", style={'margin': '0', 'color': '#7f8c8d'})
-            ], className='summary-card'),
-        ], className='summary-cards'),
+            html.H3(total_pairs, style={'margin': '0', 'color': '#2c3e50'}),
+            html.P("Total Pairs", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='summary-card'),
         
-        # Data Table
         html.Div([
-            html.Div("Trading Dashboard", className='table-header'),
-            dash_table.DataTable(
-                data=df.to_dict('records'),
-                columns=[{'name': col, 'id': col, 'presentation': 'markdown'} for col in df.columns],
-                style_cell={
-                    'textAlign': 'left',
-                    'padding': '10px',
-                    'fontFamily': 'Arial, sans-serif',
-                    'minWidth': '80px',
-                    'maxWidth': '200px',
-                    'overflow': 'hidden',
-                    'textOverflow': 'ellipsis'
-                },
-                style_header={
-                    'backgroundColor': '#3498db',
-                    'color': 'white',
-                    'fontWeight': 'bold',
-                    'textAlign': 'center'
-                },
-                style_data_conditional=[
-                    {
-                        'if': {'filter_query': '{Entry Hit} = ✅'},
-                        'backgroundColor': '#d5f4e6',
-                    },
-                    {
-                        'if': {'filter_query': '{Entry Hit} = ❌'},
-                        'backgroundColor': '#fadbd8',
-                    }
-                ],
-                page_size=15,
-                sort_action='native',
-                filter_action='native',
-                style_table={
-                    'overflowX': 'auto',
-                    'minWidth': '100%'
-                },
-                css=[{
-                    'selector': '.dash-spreadsheet-container',
-                    'rule': 'font-size: 14px;'
-                }]
-            )
-        ], className='dashboard-table')
-    ])
+            html.H3(entries_hit, style={'margin': '0', 'color': '#27ae60'}),
+            html.P("Entries Hit", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='summary-card'),
+        
+        html.Div([
+            html.H3(hit_rate, style={'margin': '0', 'color': '#3498db'}),
+            html.P("Hit Rate", style={'margin': '0', 'color': '#7f8c8d'})
+        ], className='summary-card'),
+    ]
+
+
+# Server-side table queries. Snapshot columns are display strings ('$1.23000', '4.50%', '–'),
+# so numeric views are parsed once per snapshot frame and reused across page requests.
+table_cache = {"entries": OrderedDict(), "lock": threading.Lock()}
+
+TABLE_FILTER_OPERATORS = [['ge ', '>='],
+                          ['le ', '<='],
+                          ['lt ', '<'],
+                          ['gt ', '>'],
+                          ['ne ', '!='],
+                          ['eq ', '='],
+                          ['contains '],
+                          ['datestartswith ']]
+
+
+def split_filter_part(filter_part):
+    """Split one DataTable filter expression into (column, operator, value)"""
+    for operator_type in TABLE_FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                
+                value_part = value_part.strip()
+                v0 = value_part[0] if value_part else ''
+                if v0 and v0 == value_part[-1] and v0 in ("'", '"', '`'):
+                    value = value_part[1: -1].replace('\\' + v0, v0)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                
+                return name, operator_type[0].strip(), value
+    
+    return [None] * 3
+
+
+def get_numeric_column(df, column):
+    """Numeric view of a formatted column (NaN where a cell is not a number)"""
+    # Keyed by frame identity; the frame is kept in the entry so its id cannot be reused meanwhile
+    with table_cache["lock"]:
+        entries = table_cache["entries"]
+        entry = entries.get(id(df))
+        if entry is None:
+            entry = entries[id(df)] = (df, {})
+            while len(entries) > SNAPSHOT_HISTORY_SIZE + 1:
+                entries.popitem(last=False)
+        else:
+            entries.move_to_end(id(df))
+    
+    numeric = entry[1].get(column)
+    if numeric is None:
+        text = df[column].astype(str).str.replace(r'[$,%\s]', '', regex=True)
+        numeric = pd.to_numeric(text, errors='coerce')
+        entry[1][column] = numeric
+    return numeric
+
+
+def is_numeric_column(df, column):
+    """True if most non-placeholder cells of a column are numbers"""
+    numeric = get_numeric_column(df, column)
+    filled = (~df[column].astype(str).str.strip().isin(['', '–', 'nan', 'None'])).sum()
+    return filled > 0 and numeric.notna().sum() * 2 >= filled
+
+
+def parse_filter_number(value):
+    """Filter values typed as '$1.5' or '20%' compare numerically too"""
+    if isinstance(value, float):
+        return value
+    try:
+        return float(str(value).replace('$', '').replace('%', '').replace(',', '').strip())
+    except ValueError:
+        return None
+
+
+def filter_table(df, filter_query):
+    """Apply a DataTable filter_query; comparisons are numeric on numeric columns"""
+    mask = pd.Series(True, index=df.index)
+    
+    for filter_part in (filter_query or '').split(' && '):
+        column, operator, value = split_filter_part(filter_part)
+        if column not in df.columns:
+            continue
+        
+        text = df[column].astype(str)
+        if operator == 'contains':
+            mask &= text.str.contains(str(value), case=False, regex=False)
+        elif operator == 'datestartswith':
+            mask &= text.str.startswith(str(value))
+        else:
+            number = parse_filter_number(value)
+            if number is not None and is_numeric_column(df, column):
+                mask &= getattr(get_numeric_column(df, column), operator)(number)
+            else:
+                mask &= getattr(text, operator)(str(value))
+    
+    return df[mask]
+
+
+def sort_table(df, view, sort_by):
+    """Order a filtered view of df by DataTable sort_by; numeric columns sort by value, and blanks go last"""
+    if not sort_by:
+        return view
+    
+    keys, ascending = {}, []
+    for position, sort in enumerate(sort_by):
+        column = sort.get('column_id')
+        if column not in df.columns:
+            continue
+        if is_numeric_column(df, column):
+            key = get_numeric_column(df, column)
+        else:
+            # astype(str) spells nulls 'none'/'nan'; keep them NaN so na_position applies
+            key = df[column].astype(str).str.lower().where(df[column].notna())
+        keys[position] = key.loc[view.index]
+        ascending.append(sort.get('direction') != 'desc')
+    
+    if not keys:
+        return view
+    
+    order = pd.DataFrame(keys).sort_values(list(keys), ascending=ascending, na_position='last', kind='mergesort')
+    return view.loc[order.index]
+
+
+def query_table(df, sort_by, filter_query):
+    """Filtered then sorted view of a snapshot frame"""
+    return sort_table(df, filter_table(df, filter_query), sort_by)
 
 
 def create_status_section():
@@ -1458,27 +3538,104 @@ def create_status_section():
         status_elements.extend([
             html.P(f"🔄 Last Updated: {current_data['last_update'].strftime('%Y-%m-%d %H:%M:%S')}", 
                   className='status-item'),
-            html.P("✅ Auto-refresh every 30 seconds | 📱 Telegram alerts enabled", 
+            html.P(f"✅ Background refresh every {REFRESH_INTERVAL_SECONDS} seconds | 📱 Telegram alerts enabled", 
                   className='status-item')
         ])
         
-        # Add health status
-        health = check_connection_health()
-        health_items = []
+        # Add health status from the background monitor's cache
+        health = get_cached_health()
         
-        for service, status in health.items():
-            emoji = "✅" if status else "❌"
-            service_name = service.replace('_', ' ').title()
-            health_items.append(f"{emoji} {service_name}")
+        if health:
+            health_items = []
+            
+            for service, result in health.items():
+                emoji = "✅" if result['ok'] else "❌"
+                service_name = service.replace('_', ' ').title()
+                health_items.append(f"{emoji} {service_name} ({result['latency'] * 1000:.0f}ms)")
+            
+            checked_at = min(result['checked_at'] for result in health.values())
+            health_text = " | ".join(health_items)
+            status_elements.append(
+                html.P(f"🏥 Health: {health_text} (checked {checked_at.strftime('%H:%M:%S')})", 
+                      className='status-item')
+            )
+        else:
+            status_elements.append(
+                html.P("🏥 Health: ⏳ first check running...", className='status-item')
+            )
         
-        health_text = " | ".join(health_items)
-        status_elements.append(
-            html.P(f"🏥 Health: {health_text}", 
-                  className='status-item')
-        )
+        # Add CSV loader info
+        csv_loader = get_csv_method_stats().get('load_csv_with_fallbacks')
+        if csv_loader and csv_loader["preferred"]:
+            method = csv_loader["methods"][csv_loader["preferred"]]
+            status_elements.append(
+                html.P(f"📄 CSV via {csv_loader['preferred']}: {method['success_rate'] * 100:.0f}% ok, "
+                       f"{method['avg_latency']:.2f}s avg", className='status-item')
+            )
+        
+        # Add Telegram delivery info
+        telegram = get_telegram_stats()
+        telegram_text = (f"📨 Telegram: {telegram['sent']} sent | {telegram['pending']} queued | "
+                         f"{telegram['failed']} failed | {telegram['dropped']} dropped")
+        if telegram['avg_latency'] is not None:
+            telegram_text += f" | {telegram['avg_latency']:.1f}s avg delivery"
+        status_elements.append(html.P(telegram_text, className='status-item'))
+        
+        # Add price stream info
+        if STREAMING_MODE:
+            stream = get_stream_stats()
+            if stream['connected']:
+                stream_text = (f"📡 Stream: live | {stream['fresh']}/{stream['tickers']} tickers fresh | "
+                               f"{stream['ticks']} ticks | {stream['alerts']} alerts")
+            else:
+                stream_text = f"📡 Stream: reconnecting ({stream['reconnects']} drops), prices via REST"
+            status_elements.append(html.P(stream_text, className='status-item'))
+        
+        # Add open provider circuits
+        open_circuits = [
+            f"{name} (retry in {circuit['retry_in']:.0f}s)" if circuit['state'] == 'open' else f"{name} (probing)"
+            for name, circuit in get_provider_circuit_stats().items()
+            if circuit['state'] != 'closed'
+        ]
+        if open_circuits:
+            status_elements.append(
+                html.P(f"🚧 Skipped providers: {', '.join(open_circuits)}", className='status-item')
+            )
+        
+        # Add symbols no provider could price
+        unresolved = get_unresolved_symbols()
+        if unresolved:
+            names = ", ".join(item['symbol'] for item in unresolved[:20])
+            if len(unresolved) > 20:
+                names += f" +{len(unresolved) - 20} more"
+            status_elements.append(
+                html.P(f"❓ Unresolved symbols ({len(unresolved)}): {names} "
+                       f"(next re-check in {min(item['recheck_in'] for item in unresolved):.0f}s)",
+                       className='status-item')
+            )
+        
+        # Add provider ranking info (rolling latency and success rate)
+        provider_stats_snapshot = get_provider_stats()
+        if provider_stats_snapshot:
+            ranked = sorted(provider_stats_snapshot.items(),
+                            key=lambda item: item[1]['latency'] / max(item[1]['success'], 0.01))
+            provider_text = " | ".join(
+                f"{name.replace(' (with proxy headers)', '')} {record['latency']:.2f}s {record['success'] * 100:.0f}%"
+                for name, record in ranked
+            )
+            status_elements.append(html.P(f"📡 Providers: {provider_text}", className='status-item'))
+        
+        # Add connection reuse info
+        connections = get_connection_pool_stats()
+        connection_text = (f"🔌 Connections: {connections['requests']} requests over "
+                           f"{connections['connections']} connections ({connections['reuse_pct']:.0f}% reused)")
+        if connections['async_requests']:
+            protocol = "HTTP/2" if connections['http2'] else "HTTP/1.1"
+            connection_text += f" | async {protocol}: {connections['async_requests']} requests"
+        status_elements.append(html.P(connection_text, className='status-item'))
         
         # Add memory usage info
-        alerts_count = len(current_data.get("alerts_sent", set()))
+        alerts_count = count_active_alerts()
         update_count = current_data.get('update_count', 0)
         status_elements.append(
             html.P(f"📊 Updates: {update_count} | Active Alerts: {alerts_count}", 
@@ -1492,57 +3649,82 @@ def create_alerts_section(alerts):
     """Create alerts section"""
     if alerts:
         return html.Div([
-            html.H4("📱 Recent Telegram Alerts Sent:"),
+            html.H4("📱 Recent Telegram Alerts Queued:"),
             html.Ul([html.Li(alert) for alert in alerts], className='alerts-list')
         ])
     return html.Div()
 
 
+# Last downloaded sheet: validators for conditional GETs plus the parsed frame they describe
+csv_cache = {"url": None, "etag": None, "last_modified": None, "content_hash": None, "df": None}
+
+
+def load_csv_conditional(csv_url):
+    """Download the CSV with ETag/Last-Modified validators, reusing the parsed frame when unchanged"""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (compatible; Python/3.11; Crypto Dashboard Bot)',
+        'X-Forwarded-For': '127.0.0.1',
+        'X-Real-IP': '127.0.0.1'
+    }
+    
+    cached = csv_cache["df"] if csv_cache["url"] == csv_url else None
+    if cached is not None:
+        if csv_cache["etag"]:
+            headers['If-None-Match'] = csv_cache["etag"]
+        if csv_cache["last_modified"]:
+            headers['If-Modified-Since'] = csv_cache["last_modified"]
+    
+    response = robust_session.get(csv_url, timeout=30, headers=headers)
+    
+    if response.status_code == 304 and cached is not None:
+        if DEBUG_MODE:
+            print("♻️ CSV not modified (304), reusing parsed sheet")
+        return cached
+    
+    response.raise_for_status()
+    content = response.content
+    content_hash = hashlib.sha256(content).hexdigest()
+    
+    csv_cache["etag"] = response.headers.get('ETag')
+    csv_cache["last_modified"] = response.headers.get('Last-Modified')
+    
+    # Servers without validators still let us skip parsing when the bytes are identical
+    if cached is not None and content_hash == csv_cache["content_hash"]:
+        if DEBUG_MODE:
+            print("♻️ CSV content unchanged, reusing parsed sheet")
+        return cached
+    
+    df = pd.read_csv(io.BytesIO(content))
+    csv_cache.update({"url": csv_url, "content_hash": content_hash, "df": df})
+    return df
+
+
 def load_csv_with_fallbacks(csv_url):
     """Try multiple methods to load CSV data with Railway-specific handling"""
     
     methods = [
-        ("Enhanced headers pandas", lambda: pd.read_csv(csv_url, storage_options={
+        ("Conditional requests", lambda: load_csv_conditional(csv_url)),
+        ("Enhanced headers pandas", lambda: throttled(csv_url, pd.read_csv, csv_url, storage_options={
             'User-Agent': 'Mozilla/5.0 (compatible; Python/3.11; Crypto Dashboard Bot)',
             'headers': {
                 'X-Forwarded-For': '127.0.0.1',
                 'X-Real-IP': '127.0.0.1'
             }
         })),
-        ("Enhanced headers requests", lambda: pd.read_csv(io.StringIO(
-            robust_session.get(csv_url, timeout=30, headers={
-                'User-Agent': 'Mozilla/5.0 (compatible; Python/3.11; Crypto Dashboard Bot)',
-                'X-Forwarded-For': '127.0.0.1',
-                'X-Real-IP': '127.0.0.1'
-            }).text
-        ))),
-        ("Enhanced headers urllib", lambda: pd.read_csv(urllib.request.urlopen(
+        ("Enhanced headers urllib", lambda: pd.read_csv(throttled(csv_url, urllib.request.urlopen,
             urllib.request.Request(csv_url, headers={
                 'User-Agent': 'Mozilla/5.0 (compatible; Python/3.11; Crypto Dashboard Bot)',
                 'X-Forwarded-For': '127.0.0.1',
                 'X-Real-IP': '127.0.0.1'
             })
         ))),
-        ("Direct pandas (fallback)", lambda: pd.read_csv(csv_url)),
+        ("Direct pandas (fallback)", lambda: throttled(csv_url, pd.read_csv, csv_url)),
         ("Basic requests (fallback)", lambda: pd.read_csv(io.StringIO(
-            requests.get(csv_url, timeout=30).text
+            plain_session.get(csv_url, timeout=30).text
         )))
     ]
     
-    for method_name, method_func in methods:
-        try:
-            if DEBUG_MODE:
-                print(f"🔄 Trying CSV method: {method_name}")
-            df = method_func()
-            if DEBUG_MODE:
-                print(f"✅ Success with {method_name}: {len(df)} rows loaded")
-            return df, None
-        except Exception as e:
-            if DEBUG_MODE:
-                print(f"❌ {method_name} failed: {str(e)}")
-            continue
-    
-    return None, "All CSV loading methods failed"
+    return run_csv_methods('load_csv_with_fallbacks', methods)
 
 
 def handle_railway_errors():
@@ -1578,6 +3760,10 @@ def handle_railway_errors():
 
 server = app.server
 
+# Under gunicorn the module is imported by the worker, so start refreshing right away
+if IS_RAILWAY:
+    start_background_workers()
+
 if __name__ == '__main__':
     print("🚀 Starting Enhanced Crypto Trading Dashboard...")
     
@@ -1636,7 +3822,7 @@ if __name__ == '__main__':
             print("⚠️  Warning: No external services accessible. Check your internet connection.")
         
         print("📱 Telegram notifications enabled")
-        print("🔄 Auto-refresh every 30 seconds")
+        print(f"🔄 Background refresh every {REFRESH_INTERVAL_SECONDS} seconds")
         print("📊 Dashboard available at: http://localhost:8050")
         print("🛡️  Rate limiting and retry logic enabled")
         print("🔧 Enhanced connection handling with multiple fallback APIs")
@@ -1644,6 +3830,7 @@ if __name__ == '__main__':
         try:
             # Local development - run the development server
             port = int(os.environ.get('PORT', 8050))
+            start_background_workers()
             app.run_server(host='0.0.0.0', port=port, debug=False)
         except Exception as e:
             print(f"❌ Failed to start dashboard: {e}")
@@ -0,0 +1,73 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import g
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+@pytest.fixture
+def candle_db(tmp_path, monkeypatch):
+    """Point the OHLC cache at a fresh SQLite file and start from an empty in-memory cache"""
+    path = tmp_path / "candles.sqlite3"
+    monkeypatch.setattr(g, "OHLC_CACHE_DB", str(path))
+    monkeypatch.setattr(g, "candle_cache", {"pairs": {}, "db": None, "lock": threading.Lock(),
+                                            "db_lock": threading.RLock()})
+    yield path
+    if g.candle_cache["db"] is not None:
+        g.candle_cache["db"].close()
+
+
+def fake_klines(pair, start_ts, end_ts):
+    """Closed daily klines for [start_ts, end_ts) without touching the network"""
+    return [[ts, "1", "1", "1", "1", "0", ts + DAY_MS - 1] for ts in range(start_ts, end_ts - DAY_MS, DAY_MS)]
+
+
+def test_fetch_candle_histories_persists_every_pair_with_parallel_workers(candle_db, monkeypatch):
+    monkeypatch.setattr(g, "fetch_klines", fake_klines)
+    monkeypatch.setattr(g, "OHLC_FETCH_WORKERS", 8)
+    start = datetime.now() - timedelta(days=3000)
+    earliest = {f"SYM{i}": start for i in range(40)}
+
+    histories = g.fetch_candle_histories(earliest)
+
+    assert set(histories) == set(earliest)
+    assert all(histories.values())
+    with sqlite3.connect(candle_db) as db:
+        saved = {pair for (pair,) in db.execute("SELECT pair FROM candle_ranges")}
+        candle_pairs = {pair for (pair,) in db.execute("SELECT DISTINCT pair FROM candles")}
+    expected = {f"SYM{i}USDT" for i in range(40)}
+    assert saved == expected
+    assert candle_pairs == expected
+
+
+def test_plan_candle_fetches_dedupes_spellings_of_the_same_pair():
+    symbols = ["btc", "BTC", "BTCUSDT", "ETH/USDT", "eth"]
+    start_dates = ["2024-03-01", "2024-01-15", "2024-02-01", "2024-05-01", "2024-04-01"]
+
+    row_starts, earliest = g.plan_candle_fetches(symbols, start_dates, np.ones(len(symbols), dtype=bool))
+
+    assert earliest == {"BTCUSDT": datetime(2024, 1, 15), "ETHUSDT": datetime(2024, 4, 1)}
+    assert row_starts[0] == datetime(2024, 3, 1)
+
+
+def test_fetch_candle_histories_downloads_each_pair_once(candle_db, monkeypatch):
+    calls = []
+
+    def counting_klines(pair, start_ts, end_ts):
+        calls.append(pair)
+        return fake_klines(pair, start_ts, end_ts)
+
+    monkeypatch.setattr(g, "fetch_klines", counting_klines)
+    start = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    symbols = ["btc", "BTC", "BTCUSDT"]
+    _, earliest = g.plan_candle_fetches(symbols, [start] * 3, np.ones(3, dtype=bool))
+
+    histories = g.fetch_candle_histories(earliest)
+
+    assert calls == ["BTCUSDT"]
+    assert all(histories.get(g.exchange_pair(symbol)) for symbol in symbols)
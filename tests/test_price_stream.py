@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+import numpy as np
+import pytest
+
+import g
+
+TICK = {"stream": "btcusdt@miniTicker", "data": {"e": "24hrMiniTicker", "s": "BTCUSDT", "c": "100.5"}}
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    """Fresh stream and alert state with one BTC row at a 100 entry, Telegram delivery recorded"""
+    monkeypatch.setattr(g, "ALERT_STATE_DB", "")
+    monkeypatch.setattr(g, "alert_state", {"records": OrderedDict(), "touched": set(), "db": None,
+                                           "loaded": False, "lock": threading.RLock()})
+    monkeypatch.setattr(g, "stream_state", {**g.stream_state, "prices": {}, "watch": MappingProxyType({}),
+                                            "evaluated_at": {}, "stats": {"ticks": 0, "alerts": 0, "reconnects": 0}})
+
+    queued, evaluations = [], []
+    monkeypatch.setattr(g, "enqueue_telegram_alert",
+                        lambda key, symbol, price, level, on_failure=None: queued.append((key, price)))
+    evaluate_price_alerts = g.evaluate_price_alerts
+
+    def counting_evaluate(symbols, prices, levels):
+        evaluations.append(list(symbols))
+        return evaluate_price_alerts(symbols, prices, levels)
+
+    monkeypatch.setattr(g, "evaluate_price_alerts", counting_evaluate)
+
+    levels = g.build_alert_level_matrix([[100.0]], [np.nan], [np.nan])
+    g.update_stream_watchlist(["BTC"], levels)
+    return {"levels": levels, "queued": queued, "evaluations": evaluations}
+
+
+def test_stream_tick_updates_price_and_alerts_once(stream):
+    g.handle_stream_message(TICK)
+
+    assert g.stream_state["prices"]["BTCUSDT"][0] == 100.5
+    assert g.get_streamed_prices(["BTC", "btc"]) == {"BTC": 100.5, "btc": 100.5}
+    assert stream["evaluations"] == [["BTC"]]
+    assert [key for key, _ in stream["queued"]] == [g.AlertKey("BTC", "entry1", 100.0)]
+
+    # A second tick inside STREAM_ALERT_INTERVAL_SECONDS only updates the price
+    g.handle_stream_message({**TICK, "data": {**TICK["data"], "c": "100.6"}})
+
+    assert g.stream_state["prices"]["BTCUSDT"][0] == 100.6
+    assert len(stream["evaluations"]) == 1
+    assert len(stream["queued"]) == 1
+
+
+def test_stream_tick_and_refresh_never_alert_twice(stream):
+    for _ in range(50):
+        g.alert_state["records"].clear()
+        g.stream_state["evaluated_at"].clear()
+        stream["queued"].clear()
+        start = threading.Barrier(2)
+
+        def refresh():
+            start.wait()
+            g.evaluate_price_alerts(np.array(["BTC"]), np.array([100.5]), stream["levels"])
+
+        def on_tick():
+            start.wait()
+            g.handle_stream_message(TICK)
+
+        threads = [threading.Thread(target=refresh), threading.Thread(target=on_tick)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(stream["queued"]) == 1
@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import g
+
+
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_sort_table_puts_null_text_cells_last(direction):
+    df = pd.DataFrame({"Symbol": ["eth", None, "Ada", np.nan, "btc", "nancy", "nonE"]})
+
+    ordered = g.query_table(df, [{"column_id": "Symbol", "direction": direction}], "")["Symbol"].tolist()
+
+    text = ["Ada", "btc", "eth", "nancy", "nonE"]
+    assert ordered[:5] == (text if direction == "asc" else text[::-1])
+    assert all(pd.isna(value) for value in ordered[5:])